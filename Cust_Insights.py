@@ -3,11 +3,17 @@ import requests
 import pandas as pd
 from datetime import datetime
 from huggingface_hub import InferenceClient
+from currency import DEFAULT_CURRENCY, format_money, reporting_currency
+from data_client import fetch_payload
 
 # Configuration
 QUARKUS_API = st.secrets.get("QUARKUS_API", "http://localhost:8080")
 HUGGINGFACE_API_TOKEN = st.secrets.get("HUGGINGFACE_API_TOKEN")  # Add to your secrets
+HUGGINGFACE_MODEL = st.secrets.get("HUGGINGFACE_MODEL", "mistralai/Mistral-7B-Instruct-v0.3")
 CACHE_TTL = 3600  # 1 hour cache
+QUARKUS_CURRENCY = st.secrets.get("QUARKUS_CURRENCY", DEFAULT_CURRENCY)  # Currency of analysis results
+FX_RATES_URL = st.secrets.get("FX_RATES_URL", "")  # GET -> {"base": "EUR", "rates": {"USD": 1.08}}
+FX_RATES_FILE = st.secrets.get("FX_RATES_FILE", "")  # Local JSON or currency,rate CSV
 
 st.title("Financial Dashboard")
 
@@ -17,14 +23,12 @@ tab1, tab2 = st.tabs(["Overview", "AI Insights"])
 @st.cache_data(ttl=CACHE_TTL)
 def fetch_data(url):
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return fetch_payload(url)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching data: {e}")
         return None
     except ValueError as e:
-        st.error(f"Error decoding JSON: {e}")
+        st.error(f"Error decoding response: {e}")
         return None
 
 def generate_savings_recommendations(financial_data):
@@ -34,9 +38,9 @@ def generate_savings_recommendations(financial_data):
     prompt = f"""
     [INST] As a financial advisor, analyze this financial data and provide personalized savings recommendations:
     
-    - Monthly Income: €{financial_data.get('totalIncome', 0):,.2f}
-    - Monthly Expenses: €{financial_data.get('totalExpenses', 0):,.2f}
-    - Current Savings: €{financial_data.get('savings', 0):,.2f}
+    - Monthly Income: {format_money(financial_data.get('totalIncome', 0), QUARKUS_CURRENCY)}
+    - Monthly Expenses: {format_money(financial_data.get('totalExpenses', 0), QUARKUS_CURRENCY)}
+    - Current Savings: {format_money(financial_data.get('savings', 0), QUARKUS_CURRENCY)}
     - Spending by Category: {financial_data.get('spending_by_category', {})}
     
     Provide:
@@ -50,13 +54,16 @@ def generate_savings_recommendations(financial_data):
     
     response = client.text_generation(
         prompt,
-        model="mistralai/Mistral-7B-Instruct-v0.3",
+        model=HUGGINGFACE_MODEL,
         max_new_tokens=512,
         temperature=0.7
     )
     
     return response
 
+# Reporting currency
+fx, base_currency, source_rate = reporting_currency(FX_RATES_URL, FX_RATES_FILE, QUARKUS_CURRENCY)
+
 with tab1:
     # UI Loading State
     with st.spinner("Loading financial data..."):
@@ -67,9 +74,9 @@ with tab1:
     if total_summary:
         try:
             col1, col2, col3 = st.columns(3)
-            col1.metric("Total Income", f"€{total_summary.get('totalIncome', 0):,.2f}")
-            col2.metric("Total Expenses", f"€{total_summary.get('totalExpenses', 0):,.2f}")
-            col3.metric("Savings", f"€{total_summary.get('savings', 0):,.2f}")
+            col1.metric("Total Income", format_money(total_summary.get('totalIncome', 0) * source_rate, base_currency))
+            col2.metric("Total Expenses", format_money(total_summary.get('totalExpenses', 0) * source_rate, base_currency))
+            col3.metric("Savings", format_money(total_summary.get('savings', 0) * source_rate, base_currency))
         except Exception as e:
             st.error(f"Error displaying metrics: {e}")
 
@@ -78,6 +85,7 @@ with tab1:
         try:
             st.subheader("Spending by Category")
             spending_df = pd.DataFrame.from_dict(spending, orient='index', columns=['Amount'])
+            spending_df['Amount'] *= source_rate
             st.bar_chart(spending_df)
         except Exception as e:
             st.error(f"Error displaying spending chart: {e}")
@@ -2,26 +2,32 @@ import streamlit as st
 import requests
 import pandas as pd
 from datetime import datetime
+from currency import DEFAULT_CURRENCY, format_money, reporting_currency
+from data_client import fetch_payload
 
 # Configuration (could be moved to environment variables)
 QUARKUS_API = st.secrets.get("QUARKUS_API", "http://localhost:8080")
 CACHE_TTL = 3600  # 1 hour cache
+QUARKUS_CURRENCY = st.secrets.get("QUARKUS_CURRENCY", DEFAULT_CURRENCY)  # Currency of analysis results
+FX_RATES_URL = st.secrets.get("FX_RATES_URL", "")  # GET -> {"base": "EUR", "rates": {"USD": 1.08}}
+FX_RATES_FILE = st.secrets.get("FX_RATES_FILE", "")  # Local JSON or currency,rate CSV
 
 st.title("Financial Dashboard")
 
 @st.cache_data(ttl=CACHE_TTL)
 def fetch_data(url):
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return fetch_payload(url)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching data: {e}")
         return None
     except ValueError as e:
-        st.error(f"Error decoding JSON: {e}")
+        st.error(f"Error decoding response: {e}")
         return None
 
+# Reporting currency
+fx, base_currency, source_rate = reporting_currency(FX_RATES_URL, FX_RATES_FILE, QUARKUS_CURRENCY)
+
 # UI Loading State
 with st.spinner("Loading financial data..."):
     spending = fetch_data(f"{QUARKUS_API}/analysis/spending-by-category")
@@ -31,9 +37,9 @@ with st.spinner("Loading financial data..."):
 if total_summary:
     try:
         col1, col2, col3 = st.columns(3)
-        col1.metric("Total Income", f"€{total_summary.get('totalIncome', 0):,.2f}")
-        col2.metric("Total Expenses", f"€{total_summary.get('totalExpenses', 0):,.2f}")
-        col3.metric("Savings", f"€{total_summary.get('savings', 0):,.2f}")
+        col1.metric("Total Income", format_money(total_summary.get('totalIncome', 0) * source_rate, base_currency))
+        col2.metric("Total Expenses", format_money(total_summary.get('totalExpenses', 0) * source_rate, base_currency))
+        col3.metric("Savings", format_money(total_summary.get('savings', 0) * source_rate, base_currency))
     except Exception as e:
         st.error(f"Error displaying metrics: {e}")
 
@@ -42,6 +48,7 @@ if spending:
     try:
         st.subheader("Spending by Category")
         spending_df = pd.DataFrame.from_dict(spending, orient='index', columns=['Amount'])
+        spending_df['Amount'] *= source_rate
         st.bar_chart(spending_df)
     except Exception as e:
         st.error(f"Error displaying spending chart: {e}")
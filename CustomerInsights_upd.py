@@ -6,11 +6,17 @@ from huggingface_hub import InferenceClient
 from gtts import gTTS
 from fpdf import FPDF
 import tempfile
+from currency import DEFAULT_CURRENCY, format_money, reporting_currency
+from data_client import fetch_payload
 
 # Configuration
 QUARKUS_API = st.secrets.get("QUARKUS_API", "http://localhost:8080")
 HUGGINGFACE_API_TOKEN = st.secrets.get("HUGGINGFACE_API_TOKEN", "")
+HUGGINGFACE_MODEL = st.secrets.get("HUGGINGFACE_MODEL", "mistralai/Mistral-7B-Instruct-v0.3")
 CACHE_TTL = 3600
+QUARKUS_CURRENCY = st.secrets.get("QUARKUS_CURRENCY", DEFAULT_CURRENCY)  # Currency of analysis results
+FX_RATES_URL = st.secrets.get("FX_RATES_URL", "")  # GET -> {"base": "EUR", "rates": {"USD": 1.08}}
+FX_RATES_FILE = st.secrets.get("FX_RATES_FILE", "")  # Local JSON or currency,rate CSV
 
 # Title
 st.title("Financial Dashboard")
@@ -19,14 +25,12 @@ st.title("Financial Dashboard")
 @st.cache_data(ttl=CACHE_TTL)
 def fetch_data(url):
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return fetch_payload(url)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching data: {e}")
         return None
     except ValueError as e:
-        st.error(f"Error decoding JSON: {e}")
+        st.error(f"Error decoding response: {e}")
         return None
 
 # Hugging Face LLM call
@@ -36,20 +40,20 @@ def generate_savings_recommendation(total_summary, spending, language="English")
     savings = total_summary.get('savings', 0)
 
     top_spending = sorted(spending.items(), key=lambda x: x[1], reverse=True)[:3]
-    top_categories = [f"{k} (€{v:,.2f})" for k, v in top_spending]
+    top_categories = [f"{k} ({format_money(v, QUARKUS_CURRENCY)})" for k, v in top_spending]
 
     prompt = f"""
     [INST] You are a financial advisor AI providing advice in {language}. Based on the following:
-    - Total Income: €{total_income:,.2f}
-    - Total Expenses: €{total_expenses:,.2f}
-    - Savings: €{savings:,.2f}
+    - Total Income: {format_money(total_income, QUARKUS_CURRENCY)}
+    - Total Expenses: {format_money(total_expenses, QUARKUS_CURRENCY)}
+    - Savings: {format_money(savings, QUARKUS_CURRENCY)}
     - Top Spending Categories: {', '.join(top_categories)}
 
     Provide 3 personalized savings recommendations in {language}. Keep it professional and user-friendly. [/INST]
     """
 
     client = InferenceClient(
-        model="mistralai/Mistral-7B-Instruct-v0.3",
+        model=HUGGINGFACE_MODEL,
         token=HUGGINGFACE_API_TOKEN
     )
     response = client.text_generation(prompt, max_new_tokens=300, temperature=0.5)
@@ -80,6 +84,9 @@ LANGUAGE_CODE_MAP = {
     "German": "de"
 }
 
+# Reporting currency
+fx, base_currency, source_rate = reporting_currency(FX_RATES_URL, FX_RATES_FILE, QUARKUS_CURRENCY)
+
 # Load data
 with st.spinner("Loading financial data..."):
     spending = fetch_data(f"{QUARKUS_API}/analysis/spending-by-category")
@@ -93,9 +100,9 @@ with tab1:
     if total_summary:
         try:
             col1, col2, col3 = st.columns(3)
-            col1.metric("Total Income", f"€{total_summary.get('totalIncome', 0):,.2f}")
-            col2.metric("Total Expenses", f"€{total_summary.get('totalExpenses', 0):,.2f}")
-            col3.metric("Savings", f"€{total_summary.get('savings', 0):,.2f}")
+            col1.metric("Total Income", format_money(total_summary.get('totalIncome', 0) * source_rate, base_currency))
+            col2.metric("Total Expenses", format_money(total_summary.get('totalExpenses', 0) * source_rate, base_currency))
+            col3.metric("Savings", format_money(total_summary.get('savings', 0) * source_rate, base_currency))
         except Exception as e:
             st.error(f"Error displaying metrics: {e}")
 
@@ -105,6 +112,7 @@ with tab2:
         try:
             st.subheader("Spending by Category")
             spending_df = pd.DataFrame.from_dict(spending, orient='index', columns=['Amount'])
+            spending_df['Amount'] *= source_rate
             st.bar_chart(spending_df)
         except Exception as e:
             st.error(f"Error displaying spending chart: {e}")
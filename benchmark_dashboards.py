@@ -0,0 +1,452 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import requests
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from dashboard_schema import SCHEMAS, FrameCache, build_frame
+from data_client import ARROW, ENCODINGS, FRAME_FORMATS, JSON, MSGPACK, fetch_frame, request_headers
+from stub_servers import inference_stub, make_fixture, quarkus_stub
+
+# Headless benchmark suite for the dashboard entry points.
+# Usage: python benchmark_dashboards.py --sizes 10 100 1000 --compare bench_results/baseline.json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "bench_results")
+APP_TIMEOUT = 60
+
+# Fixture records in the shape each app keeps in st.session_state
+def seed_goals(n):
+    return [{"name": f"Goal {i}", "target": 1000 + i * 10, "saved": i * 5,
+             "date": date.today() + timedelta(days=30 * (1 + i % 60))} for i in range(n)]
+
+def seed_debts(n):
+    return [{"name": f"Debt {i}", "balance": 500.0 + i * 37 % 9000,
+             "rate": 3.0 + i % 20, "payment": 50.0 + i % 200} for i in range(n)]
+
+def seed_investments(n):
+    return [{"ticker": f"TCK{i % 500:03d}", "shares": 1.0 + i % 40,
+             "cost": 10.0 + i % 90, "current": 12.0 + i % 95} for i in range(n)]
+
+def seed_assets(n):
+    return [{"description": f"Asset {i}", "value": 1000 + i * 13} for i in range(n)]
+
+def seed_liabilities(n):
+    return [{"description": f"Liability {i}", "value": 500 + i * 7} for i in range(n)]
+
+def _by_label(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No widget labelled {label!r}")
+
+# Scenario actions. Each one mutates the app and triggers exactly one rerun.
+def rerun(at, size):
+    at.run()
+
+def edit_budget(at, size):
+    # AppTest cannot drive st.data_editor, so change the saved budget table the grid is built from
+    current = at.session_state["budgets"]
+    value = float(current["Budget"].iloc[0]) + 1 if len(current) else 1.0
+    at.session_state["budgets"] = pd.DataFrame({"Category": ["Category 0000"], "Budget": [value]})
+    at.run()
+
+def add_goal(at, size):
+    at.text_input(key="goal_name").set_value("Bench goal")
+    at.number_input(key="target_amount").set_value(5000)
+    at.button(key="add_goal").click().run()
+
+def change_forecast(at, size):
+    slider = _by_label(at.slider, "Projection Period (months)")
+    slider.set_value(24 if slider.value != 24 else 12).run()
+
+def add_debt(at, size):
+    at.text_input(key="debt_name").set_value("Bench debt")
+    at.number_input(key="debt_balance").set_value(2500.0)
+    at.number_input(key="debt_rate").set_value(7.5)
+    at.number_input(key="debt_payment").set_value(150.0)
+    at.button(key="add_debt").click().run()
+
+def add_investment(at, size):
+    at.text_input(key="inv_ticker").set_value("BENCH")
+    at.number_input(key="inv_shares").set_value(10.0)
+    at.number_input(key="inv_cost").set_value(100.0)
+    at.number_input(key="inv_current").set_value(110.0)
+    at.button(key="add_investment").click().run()
+
+def add_asset(at, size):
+    at.text_input(key="asset_desc").set_value("Bench asset")
+    at.number_input(key="asset_value").set_value(1000)
+    at.button(key="add_asset").click().run()
+
+def edit_emergency_fund(at, size):
+    widget = at.number_input(key="emergency_fund")
+    widget.set_value(widget.value + 100).run()
+
+def change_language(at, size):
+    box = _by_label(at.selectbox, "🌍 Select Language")
+    box.set_value("French" if box.value != "French" else "English").run()
+
+def switch_debt_strategy(at, size):
+    # First call opens the Health Check debt panel, later calls flip between the precomputed orders
+    try:
+        radio = at.radio(key="debt_method")
+    except KeyError:
+        at.button(key="debt_button").click().run()
+        return
+    radio.set_value(radio.options[1] if radio.value == radio.options[0] else radio.options[0]).run()
+
+def _click(label):
+    def action(at, size):
+        _by_label(at.button, label).click().run()
+    action.__name__ = "generate_insights"
+    return action
+
+# Session state seeded before a scenario runs, keyed by state name
+FULL_STATE = {
+    "goals": seed_goals,
+    "debts": seed_debts,
+    "investments": seed_investments,
+    "assets": seed_assets,
+    "liabilities": seed_liabilities
+}
+
+SCENARIOS = {
+    "financial_dashboard.py": [
+        ("switch_tabs", rerun, {}),
+        ("edit_budget", edit_budget, {}),
+        ("add_goal", add_goal, {"goals": seed_goals}),
+        ("change_forecast", change_forecast, {}),
+        ("add_debt", add_debt, {"debts": seed_debts}),
+        ("add_investment", add_investment, {"investments": seed_investments}),
+        ("add_asset", add_asset, {"assets": seed_assets, "liabilities": seed_liabilities}),
+        ("health_check", edit_emergency_fund, {"debts": seed_debts}),
+        ("debt_strategy", switch_debt_strategy, {"debts": seed_debts}),
+        ("full_session_rerun", rerun, FULL_STATE),
+        ("generate_insights", _click("Generate Financial Recommendations"), {})
+    ],
+    "Cust_Insights.py": [
+        ("switch_tabs", rerun, {}),
+        ("generate_insights", _click("Generate Savings Recommendations"), {})
+    ],
+    "CustomerInsights.py": [
+        ("rerun", rerun, {})
+    ],
+    "CustomerInsights_upd.py": [
+        ("switch_tabs", rerun, {}),
+        ("change_language", change_language, {}),
+        ("generate_insights", _click("Generate Savings Tips"), {})
+    ]
+}
+
+# Currency mix of the records in the frame memory comparison
+FRAME_CURRENCIES = ["EUR", "EUR", "EUR", "USD", "GBP"]
+
+def frame_memory(sizes):
+    """Per-session DataFrame footprint: plain dict-built frames vs the shared schema
+
+    Both sides get the same records, with a currency on every record whose
+    frame has one, as the dashboard stores them.
+    """
+    report = []
+    for size in sizes:
+        spending = make_fixture(size)["/analysis/spending-by-category"]
+        budget = [{"Category": c, "Spent": v, "Budget": v * 1.2} for c, v in spending.items()]
+        investments = seed_investments(size)
+        for inv in investments:
+            inv["Value"] = inv["shares"] * inv["current"]
+            inv["Cost"] = inv["shares"] * inv["cost"]
+            inv["Gain"] = inv["Value"] - inv["Cost"]
+            inv["Gain%"] = inv["Gain"] / inv["Cost"] * 100
+        payoff = [{"Debt": d["name"], "Months": int(d["balance"] / d["payment"]),
+                   "Balance": d["balance"], "Interest": d["balance"] * d["rate"] / 100,
+                   "Payment": d["payment"]} for d in seed_debts(size)]
+        datasets = {
+            "portfolio": investments,
+            "debts": seed_debts(size),
+            "payoff": payoff,
+            "budget": budget,
+            "assets": seed_assets(size),
+            "liabilities": seed_liabilities(size)
+        }
+        totals = {"size": size, "before_bytes": 0, "after_bytes": 0, "frames": {}}
+        for name, records in datasets.items():
+            if "currency" in SCHEMAS[name]:
+                records = [{**record, "currency": FRAME_CURRENCIES[i % len(FRAME_CURRENCIES)]}
+                           for i, record in enumerate(records)]
+            before = int(pd.DataFrame(records).memory_usage(deep=True).sum())
+            after = int(build_frame(name, records).memory_usage(deep=True).sum())
+            start = time.perf_counter()
+            cache = FrameCache()
+            cache.get(name, records[:-1])
+            cache.get(name, records)
+            append_s = time.perf_counter() - start
+            totals["frames"][name] = {"before_bytes": before, "after_bytes": after,
+                                      "cached_append_s": append_s}
+            totals["before_bytes"] += before
+            totals["after_bytes"] += after
+        print(f"frames size={size:<8} before {totals['before_bytes'] / 1024:10.1f} KiB   "
+              f"after {totals['after_bytes'] / 1024:10.1f} KiB   "
+              f"({totals['after_bytes'] / totals['before_bytes']:.0%})")
+        report.append(totals)
+    return report
+
+# Wire formats compared by --transport: (content type, content encoding or None)
+TRANSPORTS = {
+    "json": (JSON, None),
+    "json+gzip": (JSON, "gzip"),
+    "msgpack+gzip": (MSGPACK, "gzip"),
+    "msgpack+zstd": (MSGPACK, "zstd"),
+    "arrow": (ARROW, None),
+    "arrow+zstd": (ARROW, "zstd")
+}
+
+def transport(rows_list, repeat):
+    """Bytes on the wire and fetch+decode time of one transactions page per wire format"""
+    report = []
+    for rows in rows_list:
+        with quarkus_stub(transactions=rows) as quarkus:
+            url = f"{quarkus.url}/analysis/transactions"
+            params = {"page": 0, "size": rows}
+
+            def json_rows():
+                # The previous path: plain JSON parsed into row dicts, then a frame
+                response = requests.get(url, params=params, timeout=60,
+                                        headers={"Accept-Encoding": "identity"})
+                response.raise_for_status()
+                return pd.DataFrame(response.json())
+
+            entry = {"rows": rows, "formats": {}}
+            candidates = {"json rows (before)": (json_rows, JSON, None)}
+            for name, (content_type, encoding) in TRANSPORTS.items():
+                if content_type not in FRAME_FORMATS or (encoding and encoding not in ENCODINGS):
+                    continue
+                encodings = (encoding,) if encoding else ()
+                candidates[name] = (
+                    lambda c=content_type, e=encodings: fetch_frame(url, params, 60, (c,), e),
+                    content_type, encoding
+                )
+            for name, (fetch, content_type, encoding) in candidates.items():
+                headers = request_headers((content_type,), (encoding,) if encoding else ())
+                with requests.get(url, params=params, timeout=60, stream=True, headers=headers) as response:
+                    wire_bytes = len(response.raw.read(decode_content=False))
+                samples = [timed(fetch) for _ in range(repeat)]
+                entry["formats"][name] = {"wire_bytes": wire_bytes,
+                                          "median_s": statistics.median(samples),
+                                          "peak_bytes": peak_memory(fetch)}
+                print(f"transport rows={rows:<8} {name:20} {wire_bytes / 1024:10.1f} KiB "
+                      f"{statistics.median(samples) * 1000:9.1f} ms")
+        report.append(entry)
+    return report
+
+def make_app(app, secrets):
+    at = AppTest.from_file(os.path.join(HERE, app), default_timeout=APP_TIMEOUT)
+    for key, value in secrets.items():
+        at.secrets[key] = value
+    return at
+
+# st.error banners the apps show when a call they depend on failed; other
+# st.error output (e.g. the health check verdict) is normal and not counted
+FAILURE_BANNERS = (
+    "Error fetching", "Error decoding", "Error displaying",
+    "Failed to", "Couldn't", "Export failed"
+)
+
+def _errors(at):
+    errors = [str(e.value) for e in at.exception]
+    errors += [e.value for e in at.error if e.value.startswith(FAILURE_BANNERS)]
+    if not at.main.children and not at.sidebar.children:
+        # AppTest reports a compile error as an empty page, not an exception
+        errors.append("App rendered nothing (does the script compile?)")
+    return errors
+
+def measure_cold_start(app, secrets):
+    """Time interpreter start, imports and first render in a fresh process"""
+    cmd = [sys.executable, os.path.abspath(__file__), "--cold-start", app,
+           "--secrets", json.dumps(secrets)]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=HERE)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        return {"seconds": None, "error": result.stderr.strip().splitlines()[-1:]}
+    return {"seconds": elapsed}
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_scenario(app, secrets, size, action, state, repeat):
+    at = make_app(app, secrets)
+    for key, factory in state.items():
+        at.session_state[key] = factory(size)
+    at.run()
+    try:
+        samples = [timed(lambda: action(at, size)) for _ in range(repeat)]
+        peak = peak_memory(lambda: action(at, size))
+    except (LookupError, KeyError) as e:
+        # The widget never rendered, usually because the script raised earlier
+        return {"median_s": None, "peak_bytes": None, "errors": _errors(at) + [repr(e)]}
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "peak_bytes": peak,
+        "errors": _errors(at)
+    }
+
+def run_suite(apps, sizes, repeat, skip_cold=False):
+    results = []
+    with quarkus_stub() as quarkus, inference_stub() as inference:
+        secrets = {
+            "QUARKUS_API": quarkus.url,
+            "HUGGINGFACE_API_TOKEN": "stub-token",
+            "HUGGINGFACE_MODEL": inference.url
+        }
+        for size in sizes:
+            quarkus.set_fixture(make_fixture(size))
+            for app in apps:
+                st.cache_data.clear()
+                entry = {"app": app, "size": size, "scenarios": {}}
+                if not skip_cold:
+                    entry["cold_start"] = measure_cold_start(app, secrets)
+
+                st.cache_data.clear()
+                at = make_app(app, secrets)
+                entry["first_render"] = {
+                    "seconds": timed(at.run),
+                    "errors": _errors(at)
+                }
+                st.cache_data.clear()
+                entry["first_render"]["peak_bytes"] = peak_memory(make_app(app, secrets).run)
+
+                for name, action, state in SCENARIOS[app]:
+                    entry["scenarios"][name] = run_scenario(app, secrets, size, action, state, repeat)
+                    scenario = entry["scenarios"][name]
+                    median = scenario["median_s"]
+                    print(f"{app:28} size={size:<6} {name:22} " +
+                          (f"{median * 1000:9.1f} ms" if median is not None else "   failed") +
+                          (f"  errors: {scenario['errors'][0]}" if scenario["errors"] else ""))
+                results.append(entry)
+    return results
+
+def _flatten(results):
+    flat = {}
+    for entry in results:
+        prefix = f"{entry['app']}[{entry['size']}]"
+        if entry.get("cold_start", {}).get("seconds") is not None:
+            flat[f"{prefix} cold_start"] = (entry["cold_start"]["seconds"], None)
+        if not entry["first_render"]["errors"]:
+            flat[f"{prefix} first_render"] = (entry["first_render"]["seconds"],
+                                              entry["first_render"]["peak_bytes"])
+        for name, scenario in entry["scenarios"].items():
+            # A failed run timed an error page, so it isn't comparable
+            if scenario["median_s"] is None or scenario["errors"]:
+                continue
+            flat[f"{prefix} {name}"] = (scenario["median_s"], scenario["peak_bytes"])
+    return flat
+
+def compare(current, baseline, threshold):
+    """Print a side-by-side comparison and return the regressed metric names"""
+    regressions = []
+    old = _flatten(baseline["results"])
+    print(f"\n{'metric':60} {'base ms':>10} {'now ms':>10} {'ratio':>7} {'mem ratio':>9}")
+    for name, (seconds, peak) in _flatten(current["results"]).items():
+        if name not in old:
+            continue
+        base_seconds, base_peak = old[name]
+        ratio = seconds / base_seconds if base_seconds else float("inf")
+        mem_ratio = peak / base_peak if peak and base_peak else 1.0
+        flag = ""
+        if ratio > 1 + threshold or mem_ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:60} {base_seconds * 1000:10.1f} {seconds * 1000:10.1f} "
+              f"{ratio:7.2f} {mem_ratio:9.2f}{flag}")
+    return regressions
+
+def _cold_start_main(app, secrets):
+    # Runs in a child process so imports are counted
+    at = make_app(app, json.loads(secrets))
+    at.run()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Streamlit dashboards headlessly")
+    parser.add_argument("--apps", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000],
+                        help="Fixture sizes (spending categories and seeded list items)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed reruns per scenario")
+    parser.add_argument("--skip-cold-start", action="store_true")
+    parser.add_argument("--frame-memory", action="store_true",
+                        help="Only compare DataFrame memory before/after the shared schema")
+    parser.add_argument("--transport", action="store_true",
+                        help="Only compare wire formats for the transactions endpoint (sizes are row counts)")
+    parser.add_argument("--output", help="Results file (default: bench_results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Baseline results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown before flagging a regression (0.2 = 20%%)")
+    parser.add_argument("--cold-start", help=argparse.SUPPRESS)
+    parser.add_argument("--secrets", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start:
+        _cold_start_main(args.cold_start, args.secrets)
+        return
+
+    transports = []
+    if args.transport:
+        results, frames = [], []
+        transports = transport(args.sizes, args.repeat)
+    elif args.frame_memory:
+        results = []
+        frames = frame_memory(args.sizes)
+    else:
+        results = run_suite(args.apps, args.sizes, args.repeat, args.skip_cold_start)
+        frames = frame_memory(args.sizes)
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "streamlit": st.__version__,
+        "sizes": args.sizes,
+        "repeat": args.repeat,
+        "results": results,
+        "frame_memory": frames,
+        "transport": transports
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
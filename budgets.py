@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from dashboard_schema import frame_from_columns
+
+# Budgets for every spending category held in one frame: edits from the grid
+# editor are applied as row deltas, alerts are computed column-wise, and the
+# whole table is saved or loaded in a single file operation.
+
+NEAR_BUDGET = 0.9  # Share of the budget spent before a category is flagged
+DEFAULT_HEADROOM = 1.2  # New categories start at 120% of what was spent
+STATUSES = ["Over", "Near", "OK"]
+
+def empty_budgets():
+    return frame_from_columns("budget", {"Category": [], "Budget": []})
+
+def load_budgets(path):
+    """Saved Category/Budget table from a CSV or Parquet file, empty when there is none"""
+    if not path or not os.path.exists(path):
+        return empty_budgets()
+    if path.endswith(".parquet"):
+        saved = pd.read_parquet(path, columns=["Category", "Budget"])
+    else:
+        saved = pd.read_csv(path, usecols=["Category", "Budget"])
+    return frame_from_columns("budget", {"Category": saved["Category"], "Budget": saved["Budget"]})
+
+def save_budgets(frame, path):
+    """Write the Category/Budget columns to CSV or Parquet (by extension) in one go"""
+    saved = frame[["Category", "Budget"]]
+    if path.endswith(".parquet"):
+        saved.to_parquet(path, index=False)
+    else:
+        saved.to_csv(path, index=False)
+
+def budget_frame(spending, saved=None):
+    """One row per spending category with its saved budget or a default one"""
+    spent = pd.Series(spending, dtype="float64")
+    budget = np.floor(spent * DEFAULT_HEADROOM)
+    if saved is not None and len(saved):
+        stored = saved.set_index(saved["Category"].astype(str))["Budget"].reindex(spent.index)
+        budget = stored.fillna(budget)
+    return frame_from_columns("budget", {
+        "Category": spent.index,
+        "Spent": spent.to_numpy(),
+        "Budget": budget.to_numpy()
+    })
+
+def apply_edits(frame, edited_rows, column="Budget"):
+    """Apply st.data_editor deltas ({row: {column: value}}) to a copy of `frame`"""
+    changes = {int(row): change[column] for row, change in edited_rows.items() if column in change}
+    if not changes:
+        return frame
+    frame = frame.copy()
+    rows = np.fromiter(changes, dtype=np.int64, count=len(changes))
+    # A cleared cell comes back as None and means no budget
+    values = np.array([0.0 if v is None else v for v in changes.values()], dtype=float)
+    frame.iloc[rows, frame.columns.get_loc(column)] = values
+    return frame
+
+def edits_by_category(saved, categories, edited_rows, column="Budget"):
+    """Fold editor deltas made against rows of `categories` into the saved Category/Budget table"""
+    changes = {
+        categories[int(row)]: 0.0 if change[column] is None else change[column]
+        for row, change in edited_rows.items()
+        if column in change and int(row) < len(categories)
+    }
+    if not changes:
+        return saved
+    kept = saved[~saved["Category"].astype(str).isin(list(changes))]
+    edited = frame_from_columns("budget", {"Category": list(changes), "Budget": list(changes.values())})
+    return pd.concat([kept, edited], ignore_index=True)
+
+def budget_alerts(frame, near=NEAR_BUDGET):
+    """Add Remaining, Used% and an Over/Near/OK Status for every category"""
+    spent = frame["Spent"].to_numpy(dtype=float)
+    budget = frame["Budget"].to_numpy(dtype=float)
+    used = np.divide(spent, budget, out=np.full(len(frame), np.nan), where=budget > 0)
+    status = np.select([spent > budget, used >= near], STATUSES[:2], STATUSES[2])
+    alerts = frame_from_columns("budget", {
+        "Remaining": budget - spent,
+        "Used%": used * 100,
+        "Status": pd.Categorical(status, categories=STATUSES)
+    })
+    return pd.concat([frame.reset_index(drop=True), alerts], axis=1)
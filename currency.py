@@ -0,0 +1,113 @@
+import csv
+import json
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+# Multi-currency support: one cached FX table, column-wise conversion.
+
+DEFAULT_CURRENCY = "EUR"  # Currency of items recorded before currencies were tracked
+FX_TTL = 3600  # Rate table is reloaded hourly
+CURRENCY_SYMBOLS = {"EUR": "€", "USD": "$", "GBP": "£", "JPY": "¥", "CHF": "CHF "}
+
+def format_money(amount, currency=DEFAULT_CURRENCY):
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    return f"{symbol}{amount:,.2f}" if symbol else f"{amount:,.2f} {currency}"
+
+class FxRates:
+    """Exchange rates quoted as units of each currency per one unit of `pivot`"""
+
+    def __init__(self, rates, pivot=DEFAULT_CURRENCY, unconverted=()):
+        rates = dict(rates)
+        rates.setdefault(pivot, 1.0)
+        self.pivot = pivot
+        self.currencies = sorted(rates)
+        self.unconverted = frozenset(unconverted)  # Currencies held at parity for want of a rate
+        self._per_pivot = np.array([float(rates[c]) for c in self.currencies])
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Build from {"base": "EUR", "rates": {"USD": 1.08, ...}}"""
+        return cls(payload["rates"], payload.get("base", DEFAULT_CURRENCY))
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a JSON payload or a currency,rate CSV whose pivot is the rate-1.0 row"""
+        if path.endswith(".csv"):
+            with open(path, newline="") as f:
+                rates = {row["currency"]: float(row["rate"]) for row in csv.DictReader(f)}
+            pivot = next((c for c, r in rates.items() if r == 1.0), DEFAULT_CURRENCY)
+            return cls(rates, pivot)
+        with open(path) as f:
+            return cls.from_payload(json.load(f))
+
+    @classmethod
+    def from_url(cls, url, timeout=10):
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        return cls.from_payload(response.json())
+
+    def _codes(self, currencies):
+        codes = pd.Categorical(currencies, categories=self.currencies).codes
+        if (codes < 0).any():
+            unknown = set(pd.Series(currencies)[codes < 0])
+            raise ValueError(f"No FX rate for {', '.join(sorted(map(str, unknown)))}")
+        return codes
+
+    def factors(self, currencies, target):
+        """Multiplier from each of `currencies` into `target`"""
+        return self._per_pivot[self._codes([target])[0]] / self._per_pivot[self._codes(currencies)]
+
+    def with_rate(self, currency, per_pivot, unconverted=False):
+        """Copy of this table with `currency` added or replaced; `unconverted` marks a stand-in rate"""
+        rates = dict(zip(self.currencies, self._per_pivot))
+        rates[currency] = per_pivot
+        flagged = self.unconverted | {currency} if unconverted else self.unconverted - {currency}
+        return FxRates(rates, self.pivot, flagged)
+
+    def rate(self, source, target):
+        return float(self.factors([source], target)[0])
+
+    def convert(self, amounts, currencies, target):
+        """Convert a column of amounts, each in its own currency, into `target`"""
+        amounts = np.asarray(amounts, dtype=float)
+        if isinstance(currencies, str):
+            return amounts * self.rate(currencies, target)
+        return amounts * self.factors(currencies, target)
+
+def load_fx_rates(url="", path=""):
+    """FX table from a rate service or local file, or EUR only when neither is configured"""
+    if url:
+        return FxRates.from_url(url)
+    if path:
+        return FxRates.from_file(path)
+    return FxRates({})
+
+@st.cache_data(ttl=FX_TTL)
+def cached_fx_rates(url="", path=""):
+    """FX table and load error, if any, shared by every session until the cache expires"""
+    try:
+        return load_fx_rates(url, path), None
+    except (requests.exceptions.RequestException, OSError, ValueError, KeyError) as e:
+        return FxRates({}), str(e)
+
+def reporting_currency(url="", path="", source=DEFAULT_CURRENCY, key=None, held=()):
+    """Sidebar reporting-currency picker; returns (fx, base_currency, source_rate)
+
+    Amounts in `source` or in any of the `held` currencies are shown
+    unconverted, with a warning, when the rate table cannot be loaded or has
+    no rate for them; those currencies are listed in `fx.unconverted`.
+    """
+    fx, error = cached_fx_rates(url, path)
+    if error:
+        st.sidebar.warning(f"FX rates unavailable, amounts are not converted: {error}")
+    missing = sorted({source, *held} - set(fx.currencies))
+    if missing and not error:
+        st.sidebar.warning(f"No FX rate for {', '.join(missing)}, amounts in them are not converted")
+    for currency in missing:
+        fx = fx.with_rate(currency, 1.0, unconverted=True)
+    base_currency = st.sidebar.selectbox("Reporting Currency", fx.currencies,
+                                         index=fx.currencies.index(source), key=key)
+    return fx, base_currency, fx.rate(source, base_currency)
@@ -0,0 +1,90 @@
+import pandas as pd
+
+from currency import DEFAULT_CURRENCY
+
+# Column dtypes for the dashboard frames. Repeated labels (tickers, currencies,
+# statuses) are categorical; free text and labels that are unique per row, such
+# as budget categories, are Arrow-backed strings when pyarrow is installed, and
+# counts use narrow integers. Money stays float64 so cents survive on large
+# balances.
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT = "string[pyarrow]"
+except ImportError:
+    TEXT = "string"
+
+SCHEMAS = {
+    "portfolio": {
+        "ticker": "category", "currency": "category", "shares": "float64", "cost": "float64",
+        "current": "float64", "Value": "float64", "Cost": "float64", "Gain": "float64",
+        "Gain%": "float32"
+    },
+    "debts": {
+        "name": TEXT, "balance": "float64", "rate": "float32", "payment": "float64",
+        "currency": "category"
+    },
+    "payoff": {
+        "Debt": TEXT, "Months": "Int32", "Balance": "float64", "Interest": "float64",
+        "Payment": "float64"
+    },
+    "goals": {
+        "name": TEXT, "target": "float64", "saved": "float64", "date": "datetime64[ns]",
+        "currency": "category"
+    },
+    "budget": {
+        "Category": TEXT, "Spent": "float64", "Budget": "float64", "Remaining": "float64",
+        "Used%": "float32", "Status": "category"
+    },
+    "assets": {"description": TEXT, "value": "float64", "currency": "category"},
+    "liabilities": {"description": TEXT, "value": "float64", "currency": "category"}
+}
+
+# Values for keys missing from older session records
+DEFAULTS = {"currency": DEFAULT_CURRENCY}
+
+def frame_from_columns(name, columns):
+    """Build a frame from a dict of list/array columns, cast to the named schema"""
+    frame = {}
+    for col, dtype in SCHEMAS[name].items():
+        if col not in columns:
+            continue
+        values = columns[col]
+        if isinstance(values, pd.Categorical):
+            frame[col] = values
+        else:
+            frame[col] = pd.Series(values).astype(dtype)
+    return pd.DataFrame(frame)
+
+def build_frame(name, records):
+    """Build a frame from a list of dicts, one column at a time"""
+    if not records:
+        return frame_from_columns(name, {col: [] for col in SCHEMAS[name]})
+    present = set(records[0]) | set(DEFAULTS)
+    columns = {col: [record.get(col, DEFAULTS.get(col)) for record in records]
+               for col in SCHEMAS[name] if col in present}
+    return frame_from_columns(name, columns)
+
+def _union_categories(old, new):
+    for col in old.columns:
+        if isinstance(old[col].dtype, pd.CategoricalDtype) and col in new:
+            categories = old[col].cat.categories.union(new[col].cat.categories)
+            old[col] = old[col].cat.set_categories(categories)
+            new[col] = new[col].cat.set_categories(categories)
+    return old, new
+
+class FrameCache:
+    """Frames for append-only session lists, extended with only the new records"""
+
+    def __init__(self):
+        self._frames = {}
+
+    def get(self, name, records):
+        frame, count = self._frames.get(name, (None, 0))
+        if frame is None or len(records) < count:
+            frame = build_frame(name, records)
+        elif len(records) > count:
+            old, new = _union_categories(frame, build_frame(name, records[count:]))
+            frame = pd.concat([old, new], ignore_index=True)
+        self._frames[name] = (frame, len(records))
+        return frame
@@ -0,0 +1,87 @@
+import io
+
+import pandas as pd
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Client for the Quarkus analysis service. Each request advertises the
+# compact formats and compressions this install can decode, and the server
+# picks one: Arrow IPC or column-oriented MessagePack for tables, falling back
+# to JSON. Tables are decoded straight into DataFrames, never via row dicts.
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+except ImportError:
+    pa = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ARROW = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+JSON = "application/json"
+
+# urllib3 decompresses these transparently; zstd needs Python 3.14+ or the backports.zstd package
+ENCODINGS = ("zstd", "gzip") if "zstd" in ACCEPT_ENCODING else ("gzip",)
+FRAME_FORMATS = ((ARROW,) if pa else ()) + ((MSGPACK,) if msgpack else ()) + (JSON,)
+PAYLOAD_FORMATS = ((MSGPACK,) if msgpack else ()) + (JSON,)
+
+def negotiate(header, offered):
+    """The entry of `offered` that an Accept-style header ranks highest, or None"""
+    ranked = []
+    for position, part in enumerate((header or "*/*").split(",")):
+        value, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            ranked.append((-q, position, value))
+    for _, _, value in sorted(ranked):
+        if value in ("*", "*/*"):
+            return offered[0] if offered else None
+        for candidate in offered:
+            if value == candidate or (value.endswith("/*") and candidate.startswith(value[:-1])):
+                return candidate
+    return None
+
+def request_headers(formats, encodings=ENCODINGS):
+    """Accept headers preferring `formats` and `encodings` in the order given"""
+    def ranked(values):
+        return ", ".join(v if i == 0 else f"{v};q={1 - i / 10:.1f}" for i, v in enumerate(values))
+    return {"Accept": ranked(formats), "Accept-Encoding": ranked(encodings) or "identity"}
+
+def _get(url, params, timeout, formats, encodings):
+    response = requests.get(url, params=params, timeout=timeout,
+                            headers=request_headers(formats, encodings))
+    response.raise_for_status()
+    return response
+
+def _content_type(response):
+    return response.headers.get("Content-Type", JSON).split(";")[0].strip()
+
+def fetch_frame(url, params=None, timeout=10, formats=FRAME_FORMATS, encodings=ENCODINGS):
+    """GET a table as a DataFrame in the most compact format both sides support"""
+    response = _get(url, params, timeout, formats, encodings)
+    content_type = _content_type(response)
+    if content_type == ARROW and pa:
+        return pa.ipc.open_stream(response.content).read_pandas()
+    if content_type == MSGPACK and msgpack:
+        # Tables travel column-oriented: {"column": [values, ...]}
+        return pd.DataFrame(msgpack.unpackb(response.content))
+    if not response.content.strip(b" \r\n\t[]"):
+        return pd.DataFrame()
+    return pd.read_json(io.BytesIO(response.content), orient="records", convert_dates=False)
+
+def fetch_payload(url, params=None, timeout=10, formats=PAYLOAD_FORMATS, encodings=ENCODINGS):
+    """GET a small JSON-shaped document (summaries, mappings), compressed and packed when possible"""
+    response = _get(url, params, timeout, formats, encodings)
+    if _content_type(response) == MSGPACK and msgpack:
+        return msgpack.unpackb(response.content)
+    return response.json()
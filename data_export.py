@@ -0,0 +1,252 @@
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import weakref
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dashboard_schema import build_frame
+from data_client import fetch_frame, fetch_payload
+from goal_solver import project_cash_flow
+
+# Streaming exports of dashboard datasets to CSV, JSONL or Parquet. Each
+# dataset is produced as an iterator of DataFrame chunks and each writer
+# turns chunks into bytes as they arrive, so no export is ever held in full.
+
+CHUNK_ROWS = 50_000
+NEVER_PAID_OFF = "payment does not cover interest"
+
+# Dataset chunk generators
+def transactions_chunks(api, page_size=CHUNK_ROWS, timeout=30):
+    """Page through the analysis service's transactions, one request per chunk"""
+    page = 0
+    while True:
+        frame = fetch_frame(f"{api}/analysis/transactions",
+                            params={"page": page, "size": page_size}, timeout=timeout)
+        if frame.empty:
+            return
+        yield frame
+        if len(frame) < page_size:
+            return
+        page += 1
+
+def spending_chunks(spending, rate=1.0):
+    """Spending per category, with amounts scaled by `rate` (e.g. into the reporting currency)"""
+    yield pd.DataFrame({"Category": list(spending), "Amount": np.fromiter(spending.values(), float) * rate})
+
+def forecast_chunks(total_summary, months, income_growth, expense_growth, rate=1.0):
+    income, expenses, savings = project_cash_flow(total_summary["totalIncome"] * rate,
+                                                  total_summary["totalExpenses"] * rate,
+                                                  income_growth, expense_growth, months)
+    yield pd.DataFrame({
+        "Month": pd.date_range(datetime.today(), periods=months, freq="ME").strftime("%b %Y"),
+        "Income": income,
+        "Expenses": expenses,
+        "Savings": savings
+    })
+
+def debt_schedule_chunks(debts, max_months=600, chunk_months=60):
+    """Month-by-month amortisation of every debt, vectorized across debts
+
+    Amounts stay in each debt's currency, named in the Currency column. A debt
+    whose payment does not cover its interest gets a single row with a Note
+    saying so, since it is never paid off.
+    """
+    debts_df = debts if isinstance(debts, pd.DataFrame) else build_frame("debts", debts)
+    names = debts_df["name"].to_numpy()
+    currencies = debts_df["currency"].astype(str).to_numpy()
+    balance = debts_df["balance"].to_numpy(dtype=float).copy()
+    monthly_rate = debts_df["rate"].to_numpy(dtype=float) / 100 / 12
+    payment = debts_df["payment"].to_numpy(dtype=float)
+
+    for first in range(1, max_months + 1, chunk_months):
+        parts = []
+        for month in range(first, min(first + chunk_months, max_months + 1)):
+            open_debts = balance > 0
+            if not open_debts.any():
+                break
+            interest = balance * monthly_rate
+            paid = np.minimum(payment, balance + interest)
+            # Debts whose payment does not cover the interest never amortise: flag them once, then drop them
+            stuck = open_debts & (paid <= interest)
+            balance = np.where(open_debts & ~stuck, balance + interest - paid, balance)
+            balance[balance < 0.005] = 0
+            parts.append(pd.DataFrame({
+                "Debt": names[open_debts],
+                "Currency": currencies[open_debts],
+                "Month": month,
+                "Payment": paid[open_debts],
+                "Interest": interest[open_debts],
+                "Principal": paid[open_debts] - interest[open_debts],
+                "Balance": balance[open_debts],
+                "Note": np.where(stuck, NEVER_PAID_OFF, "")[open_debts]
+            }))
+            balance[stuck] = 0
+        if not parts:
+            return
+        yield pd.concat(parts, ignore_index=True)
+
+def frame_chunks(frame, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+def networth_chunks(history, user_id, freq="M"):
+    yield history.query(user_id, freq=freq).dropna()
+
+# Writers: chunks in, bytes out
+def stream_csv(chunks):
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+def stream_jsonl(chunks):
+    for chunk in chunks:
+        if len(chunk):
+            data = chunk.to_json(orient="records", lines=True, date_format="iso")
+            yield (data if data.endswith("\n") else data + "\n").encode("utf-8")
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after each write"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+def stream_parquet(chunks):
+    """One Parquet row group per chunk (requires pyarrow)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(sink, table.schema, compression="zstd")
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            yield sink.drain()
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.drain()
+
+FORMATS = {
+    "csv": (stream_csv, "text/csv", "csv"),
+    "jsonl": (stream_jsonl, "application/x-ndjson", "jsonl"),
+    "parquet": (stream_parquet, "application/vnd.apache.parquet", "parquet")
+}
+
+def write_export(chunks, fmt, fileobj):
+    """Stream `chunks` into an open binary file; returns the number of bytes written"""
+    stream, _, _ = FORMATS[fmt]
+    written = 0
+    for data in stream(chunks):
+        fileobj.write(data)
+        written += len(data)
+    return written
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class TempExport:
+    """Finished export on disk, deleted once downloaded, replaced, or when its session is gone"""
+
+    def __init__(self, extension, file_name, mime):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{extension}") as f:
+            self.path = f.name
+        self.file_name = file_name
+        self.mime = mime
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+
+    @property
+    def available(self):
+        return self._finalizer.alive
+
+    def read_once(self):
+        """File contents for a single download; the file is deleted afterwards"""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.remove()
+        return data
+
+    def remove(self):
+        self._finalizer()
+
+def _load_records(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dashboard datasets without loading them in full")
+    parser.add_argument("dataset", choices=["transactions", "spending", "forecast", "debt_schedule",
+                                            "portfolio", "networth"])
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--api", default="http://localhost:8080", help="Quarkus analysis service URL")
+    parser.add_argument("--input", help="JSON records for debt_schedule/portfolio, history directory for networth")
+    parser.add_argument("--user", default="default", help="User id for networth")
+    parser.add_argument("--months", type=int, default=12, help="Forecast horizon")
+    parser.add_argument("--income-growth", type=float, default=0.5)
+    parser.add_argument("--expense-growth", type=float, default=0.3)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.dataset in ("debt_schedule", "portfolio", "networth") and not args.input:
+        parser.error(f"{args.dataset} needs --input")
+
+    if args.dataset == "transactions":
+        chunks = transactions_chunks(args.api, args.chunk_rows)
+    elif args.dataset == "spending":
+        chunks = spending_chunks(fetch_payload(f"{args.api}/analysis/spending-by-category", timeout=30))
+    elif args.dataset == "forecast":
+        total_summary = fetch_payload(f"{args.api}/analysis/total-summary", timeout=30)
+        chunks = forecast_chunks(total_summary, args.months, args.income_growth, args.expense_growth)
+    elif args.dataset == "debt_schedule":
+        chunks = debt_schedule_chunks(_load_records(args.input))
+    elif args.dataset == "portfolio":
+        from price_feed import Portfolio
+        portfolio = Portfolio()
+        portfolio.sync(_load_records(args.input))
+        chunks = frame_chunks(portfolio.to_frame(), args.chunk_rows)
+    else:
+        from networth_history import NetWorthHistory
+        history = NetWorthHistory(directory=args.input)
+        chunks = networth_chunks(history, args.user)
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            written = write_export(chunks, args.format, f)
+        print(f"Wrote {written:,} bytes to {args.output}", file=sys.stderr)
+    else:
+        write_export(chunks, args.format, sys.stdout.buffer)
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,35 @@
 import streamlit as st
 import requests
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from datetime import datetime, timedelta
 from huggingface_hub import InferenceClient
+from budgets import (NEAR_BUDGET, apply_edits, budget_alerts, budget_frame, edits_by_category, load_budgets,
+                     save_budgets)
+from currency import DEFAULT_CURRENCY, format_money, reporting_currency
+from dashboard_schema import FrameCache, frame_from_columns
+from data_client import fetch_payload
+from data_export import (FORMATS, TempExport, debt_schedule_chunks, forecast_chunks, frame_chunks,
+                         networth_chunks, spending_chunks, transactions_chunks, write_export)
+from goal_solver import HORIZON_MONTHS, project_cash_flow, solve_goals
+from health_plans import GOAL_TYPES, SAVINGS_TARGET, TOP_TIPS, PlanStore, compute_plans, snapshot_key
+from networth_history import NetWorthHistory
+from price_feed import FileQuoteSource, HttpQuoteSource, Portfolio, PriceFeed
 
 # Configuration
 QUARKUS_API = st.secrets.get("QUARKUS_API", "http://localhost:8080")
 HUGGINGFACE_API_TOKEN = st.secrets.get("HUGGINGFACE_API_TOKEN", "")
+HUGGINGFACE_MODEL = st.secrets.get("HUGGINGFACE_MODEL", "mistralai/Mistral-7B-Instruct-v0.3")
 CACHE_TTL = 3600  # 1 hour cache
+PRICE_FEED_URL = st.secrets.get("PRICE_FEED_URL", "")  # GET ?symbols=A,B -> {ticker: price}
+PRICE_FILE = st.secrets.get("PRICE_FILE", "")  # Local JSON or CSV quotes
+PRICE_TTL = 300  # 5 minute quote cache
+QUARKUS_CURRENCY = st.secrets.get("QUARKUS_CURRENCY", DEFAULT_CURRENCY)  # Currency of analysis results
+FX_RATES_URL = st.secrets.get("FX_RATES_URL", "")  # GET -> {"base": "EUR", "rates": {"USD": 1.08}}
+FX_RATES_FILE = st.secrets.get("FX_RATES_FILE", "")  # Local JSON or currency,rate CSV
+BUDGETS_PATH = st.secrets.get("BUDGETS_PATH", "")  # CSV or Parquet file of saved budgets
+NETWORTH_PATH = st.secrets.get("NETWORTH_PATH", "")  # Directory of net worth histories, one file per user
 
 # Initialize session state variables
 if 'assets' not in st.session_state:
@@ -21,6 +42,12 @@ if 'debts' not in st.session_state:
     st.session_state.debts = []
 if 'goals' not in st.session_state:
     st.session_state.goals = []
+if 'portfolio' not in st.session_state:
+    st.session_state.portfolio = Portfolio()
+if 'frames' not in st.session_state:
+    st.session_state.frames = FrameCache()
+if 'budgets' not in st.session_state:
+    st.session_state.budgets = load_budgets(BUDGETS_PATH)
 
 # App title and setup
 st.set_page_config(layout="wide", page_title="Advanced Financial Dashboard")
@@ -36,16 +63,45 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
 @st.cache_data(ttl=CACHE_TTL)
 def fetch_data(url):
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return fetch_payload(url)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching data: {e}")
         return None
     except ValueError as e:
-        st.error(f"Error decoding JSON: {e}")
+        st.error(f"Error decoding response: {e}")
         return None
 
+@st.cache_resource
+def get_price_feed():
+    """Quote cache shared by every session, or None when no quote source is configured"""
+    if PRICE_FEED_URL:
+        return PriceFeed(HttpQuoteSource(PRICE_FEED_URL), ttl=PRICE_TTL)
+    if PRICE_FILE:
+        return PriceFeed(FileQuoteSource(PRICE_FILE), ttl=PRICE_TTL)
+    return None
+
+@st.cache_resource
+def get_networth_history():
+    """Net worth snapshots of logged-in users, shared by every session and read from NETWORTH_PATH"""
+    return NetWorthHistory(directory=NETWORTH_PATH or None)
+
+def networth_store():
+    """History store and series key for the current user
+
+    Logged-in users share the persisted store, keyed by their email. Without
+    a login the history is kept in this session only.
+    """
+    if st.user.get("is_logged_in") and st.user.get("email"):
+        return get_networth_history(), st.user.get("email")
+    if 'networth' not in st.session_state:
+        st.session_state.networth = NetWorthHistory()
+    return st.session_state.networth, "session"
+
+@st.cache_resource
+def get_plan_store():
+    """Background workers and results for the Health Check action plans"""
+    return PlanStore()
+
 def generate_savings_recommendations(financial_data):
     """Generate personalized savings recommendations using HuggingFace LLM"""
     client = InferenceClient(token=HUGGINGFACE_API_TOKEN)
@@ -53,9 +109,9 @@ def generate_savings_recommendations(financial_data):
     prompt = f"""
     [INST] As a financial advisor, analyze this financial data and provide personalized savings recommendations:
     
-    - Monthly Income: €{financial_data.get('totalIncome', 0):,.2f}
-    - Monthly Expenses: €{financial_data.get('totalExpenses', 0):,.2f}
-    - Current Savings: €{financial_data.get('savings', 0):,.2f}
+    - Monthly Income: {format_money(financial_data.get('totalIncome', 0), QUARKUS_CURRENCY)}
+    - Monthly Expenses: {format_money(financial_data.get('totalExpenses', 0), QUARKUS_CURRENCY)}
+    - Current Savings: {format_money(financial_data.get('savings', 0), QUARKUS_CURRENCY)}
     - Spending by Category: {financial_data.get('spending_by_category', {})}
     
     Provide:
@@ -69,13 +125,38 @@ def generate_savings_recommendations(financial_data):
     
     response = client.text_generation(
         prompt,
-        model="mistralai/Mistral-7B-Instruct-v0.3",
+        model=HUGGINGFACE_MODEL,
         max_new_tokens=512,
         temperature=0.7
     )
     
     return response
 
+def held_currencies():
+    """Currencies of every amount recorded in this session"""
+    frames = st.session_state.frames
+    held = {inv.get('currency', DEFAULT_CURRENCY) for inv in st.session_state.investments}
+    for name in ("assets", "liabilities", "debts", "goals"):
+        held.update(frames.get(name, st.session_state[name])['currency'].unique())
+    return held
+
+# Reporting currency: every amount below is converted into it
+fx, base_currency, source_rate = reporting_currency(FX_RATES_URL, FX_RATES_FILE, QUARKUS_CURRENCY,
+                                                    key="base_currency", held=held_currencies())
+currency_options = [base_currency] + [c for c in fx.currencies if c != base_currency]
+
+def money(amount):
+    return format_money(amount, base_currency)
+
+def to_base(frame, field='value'):
+    """Convert one amount column of a session frame into the reporting currency"""
+    return fx.convert(frame[field], frame['currency'], base_currency)
+
+def debts_in_base(debts_df):
+    """Debts with balance and payment converted into the reporting currency"""
+    return debts_df.assign(balance=to_base(debts_df, 'balance'), payment=to_base(debts_df, 'payment'),
+                           currency=base_currency)
+
 # Tab 1: Overview
 with tab1:
     st.header("📊 Financial Overview")
@@ -89,9 +170,9 @@ with tab1:
     if total_summary:
         try:
             col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Total Income", f"€{total_summary.get('totalIncome', 0):,.2f}")
-            col2.metric("Total Expenses", f"€{total_summary.get('totalExpenses', 0):,.2f}")
-            col3.metric("Savings", f"€{total_summary.get('savings', 0):,.2f}")
+            col1.metric("Total Income", money(total_summary.get('totalIncome', 0) * source_rate))
+            col2.metric("Total Expenses", money(total_summary.get('totalExpenses', 0) * source_rate))
+            col3.metric("Savings", money(total_summary.get('savings', 0) * source_rate))
             col4.metric("Savings Rate", f"{(total_summary.get('savings', 0)/total_summary.get('totalIncome', 1)*100):.1f}%")
         except Exception as e:
             st.error(f"Error displaying metrics: {e}")
@@ -101,6 +182,7 @@ with tab1:
         try:
             st.subheader("Spending by Category")
             spending_df = pd.DataFrame.from_dict(spending, orient='index', columns=['Amount'])
+            spending_df['Amount'] *= source_rate
             fig = px.pie(spending_df, values='Amount', names=spending_df.index, title="Spending Distribution")
             st.plotly_chart(fig, use_container_width=True)
             
@@ -153,37 +235,67 @@ with tab3:
     st.header("💰 Budget Management")
     
     if spending:
-        # Budget setup by category
+        # Budget setup by category: one grid for every category, edits kept as row deltas
+        categories = tuple(spending)
+        previous = st.session_state.get('budget_categories')
+        if previous is not None and previous != categories and 'budget_editor' in st.session_state:
+            # Editor deltas are keyed by row, so keep them by category before the rows move
+            st.session_state.budgets = edits_by_category(
+                st.session_state.budgets, previous, st.session_state.budget_editor["edited_rows"])
+        st.session_state.budget_categories = categories
+        # Indexed by category: the index is part of the editor's identity, so a new
+        # set or order of categories starts a fresh editor instead of replaying old rows
+        base_df = budget_frame(spending, st.session_state.budgets).set_index(pd.Index(categories))
         with st.expander("Set Monthly Budgets", expanded=True):
-            categories = list(spending.keys())
-            budgets = {}
-            cols = st.columns(3)
-            for i, cat in enumerate(categories):
-                with cols[i % 3]:
-                    budgets[cat] = st.number_input(
-                        f"{cat} Budget", 
-                        min_value=0, 
-                        value=int(spending.get(cat, 0)*1.2),
-                        key=f"budget_{cat}"
-                    )
+            st.data_editor(
+                base_df,
+                column_config={
+                    "Budget": st.column_config.NumberColumn("Budget", min_value=0, step=1, format="%.0f")
+                },
+                disabled=["Category", "Spent"],
+                hide_index=True,
+                use_container_width=True,
+                key="budget_editor"
+            )
+            budget_df = apply_edits(base_df, st.session_state.budget_editor["edited_rows"])
+            
+            col1, col2 = st.columns(2)
+            if col1.button("Save Budgets", key="save_budgets", disabled=not BUDGETS_PATH):
+                try:
+                    save_budgets(budget_df, BUDGETS_PATH)
+                    st.session_state.budgets = budget_df[['Category', 'Budget']]
+                    st.success(f"Saved {len(budget_df)} budgets")
+                except (OSError, ImportError) as e:
+                    st.error(f"Failed to save budgets: {e}")
+            if col2.button("Reload Saved Budgets", key="reload_budgets", disabled=not BUDGETS_PATH):
+                st.session_state.budgets = load_budgets(BUDGETS_PATH)
+                del st.session_state.budget_editor
+                st.rerun()
         
-        # Budget vs Actual visualization
-        budget_df = pd.DataFrame({
-            'Category': list(spending.keys()),
-            'Spent': list(spending.values()),
-            'Budget': [budgets.get(cat, 0) for cat in spending.keys()]
-        })
+        budget_df = budget_alerts(budget_df)
         
-        fig = px.bar(budget_df, x='Category', y=['Spent', 'Budget'], 
-                    barmode='group', title="Budget vs Actual Spending")
+        # Budget vs Actual visualization for the categories closest to their limit
+        chart_df = budget_df.sort_values('Used%', ascending=False, na_position='first').head(25)
+        fig = px.bar(chart_df, x='Category', y=['Spent', 'Budget'], 
+                    barmode='group', title="Budget vs Actual Spending (highest usage)")
         st.plotly_chart(fig, use_container_width=True)
         
         # Budget alerts
-        over_budget = budget_df[budget_df['Spent'] > budget_df['Budget']]
-        if not over_budget.empty:
-            st.warning(f"⚠️ Over budget in: {', '.join(over_budget['Category'])}")
-        else:
+        alerts = budget_df[budget_df['Status'] != "OK"].sort_values('Used%', ascending=False, na_position='first')
+        over_count = int((alerts['Status'] == "Over").sum())
+        if over_count:
+            st.warning(f"⚠️ Over budget in {over_count} categories")
+        if len(alerts) > over_count:
+            st.info(f"{len(alerts) - over_count} categories above {NEAR_BUDGET:.0%} of budget")
+        if alerts.empty:
             st.success("All categories within budget!")
+        else:
+            st.dataframe(
+                alerts.style.format({
+                    'Spent': '{:,.2f}', 'Budget': '{:,.2f}', 'Remaining': '{:,.2f}', 'Used%': '{:.1f}%'
+                }, na_rep="n/a"),
+                hide_index=True, use_container_width=True
+            )
 
 # Tab 4: Goals
 with tab4:
@@ -204,24 +316,63 @@ with tab4:
                 "name": goal_name,
                 "target": target_amount,
                 "saved": current_saved,
-                "date": target_date
+                "date": target_date,
+                "currency": base_currency
             })
             st.success("Goal added!")
     
     # Display goals
     if st.session_state.goals:
+        # Feasibility of all goals at once against the forecast savings
+        goals_df = st.session_state.frames.get("goals", st.session_state.goals)
+        if total_summary:
+            _, _, forecast_savings = project_cash_flow(
+                total_summary.get('totalIncome', 0) * source_rate,
+                total_summary.get('totalExpenses', 0) * source_rate,
+                st.session_state.get("income_growth", 0.5),
+                st.session_state.get("expense_growth", 0.3),
+                HORIZON_MONTHS
+            )
+        else:
+            forecast_savings = np.zeros(HORIZON_MONTHS)
+        goal_budget = st.number_input(
+            "Monthly Savings for Goals", min_value=0.0,
+            value=float(max(0, forecast_savings[0])), key="goal_budget"
+        )
+        # Scale the forecast so this month matches the amount set aside
+        if forecast_savings[0] > 0:
+            forecast_savings = forecast_savings * (goal_budget / forecast_savings[0])
+        else:
+            forecast_savings = np.full(HORIZON_MONTHS, goal_budget)
+        plan = solve_goals(
+            to_base(goals_df, 'target'), to_base(goals_df, 'saved'), goals_df['date'],
+            forecast_savings
+        )
+        plan.insert(0, "Goal", goals_df['name'])
+        st.subheader("Goal Feasibility")
+        st.dataframe(
+            plan.style.format({
+                "Required Monthly": money,
+                "Allocated Monthly": money,
+                "Projected Completion": lambda d: d.strftime("%b %Y") if pd.notna(d) else "Not reached",
+                "Feasibility": "{:.0%}"
+            }),
+            hide_index=True, use_container_width=True
+        )
+
         for i, goal in enumerate(st.session_state.goals):
             with st.container(border=True):
+                rate = fx.rate(goal.get('currency', DEFAULT_CURRENCY), base_currency)
                 cols = st.columns([2,1,1,1,1])
                 with cols[0]:
                     st.subheader(goal['name'])
                 with cols[1]:
-                    st.metric("Target", f"€{goal['target']:,.2f}")
+                    st.metric("Target", money(goal['target'] * rate))
                 with cols[2]:
-                    st.metric("Saved", f"€{goal['saved']:,.2f}")
+                    st.metric("Saved", money(goal['saved'] * rate))
                 with cols[3]:
                     remaining = max(0, goal['target'] - goal['saved'])
-                    st.metric("Remaining", f"€{remaining:,.2f}")
+                    st.metric("Remaining", money(remaining * rate))
                 with cols[4]:
                     progress = min(100, (goal['saved']/goal['target'])*100)
                     st.progress(int(progress), text=f"{progress:.1f}%")
@@ -235,22 +386,23 @@ with tab5:
     if total_summary:
         # Forecasting parameters
         with st.expander("Forecast Settings"):
-            months = st.slider("Projection Period (months)", 1, 24, 6)
-            income_growth = st.number_input("Expected Income Growth (% per month)", value=0.5)
-            expense_growth = st.number_input("Expected Expense Growth (% per month)", value=0.3)
+            months = st.slider("Projection Period (months)", 1, 24, 6, key="forecast_months")
+            income_growth = st.number_input("Expected Income Growth (% per month)", value=0.5,
+                                            key="income_growth")
+            expense_growth = st.number_input("Expected Expense Growth (% per month)", value=0.3,
+                                             key="expense_growth")
         
         # Generate forecast
-        dates = pd.date_range(datetime.today(), periods=months, freq='M')
-        forecast = []
-        for i, date in enumerate(dates):
-            forecast.append({
-                'Month': date.strftime("%b %Y"),
-                'Income': total_summary['totalIncome'] * (1 + income_growth/100)**i,
-                'Expenses': total_summary['totalExpenses'] * (1 + expense_growth/100)**i,
-                'Savings': (total_summary['totalIncome'] * (1 + income_growth/100)**i) - 
-                          (total_summary['totalExpenses'] * (1 + expense_growth/100)**i)
-            })
-        forecast_df = pd.DataFrame(forecast)
+        income, expenses, savings = project_cash_flow(
+            total_summary['totalIncome'] * source_rate, total_summary['totalExpenses'] * source_rate,
+            income_growth, expense_growth, months
+        )
+        forecast_df = pd.DataFrame({
+            'Month': pd.date_range(datetime.today(), periods=months, freq='ME').strftime("%b %Y"),
+            'Income': income,
+            'Expenses': expenses,
+            'Savings': savings
+        })
         
         # Visualization
         fig = px.line(forecast_df, x='Month', y=['Income', 'Expenses', 'Savings'], 
@@ -262,8 +414,8 @@ with tab5:
         avg_savings = forecast_df['Savings'].mean()
         
         col1, col2 = st.columns(2)
-        col1.metric("Projected Total Savings", f"€{total_savings:,.2f}")
-        col2.metric("Average Monthly Savings", f"€{avg_savings:,.2f}")
+        col1.metric("Projected Total Savings", money(total_savings))
+        col2.metric("Average Monthly Savings", money(avg_savings))
     else:
         st.warning("Please load financial data in the Overview tab first")
 
@@ -273,7 +425,7 @@ with tab6:
     
     # Debt entry form
     with st.expander("Add New Debt"):
-        cols = st.columns(4)
+        cols = st.columns(5)
         with cols[0]: 
             debt_name = st.text_input("Debt Name", key="debt_name")
         with cols[1]: 
@@ -282,13 +434,16 @@ with tab6:
             debt_rate = st.number_input("Interest Rate (%)", min_value=0.0, key="debt_rate")
         with cols[3]: 
             debt_payment = st.number_input("Monthly Payment", min_value=0.0, key="debt_payment")
+        with cols[4]: 
+            debt_currency = st.selectbox("Currency", currency_options, key="debt_currency")
         
         if st.button("Add Debt", key="add_debt"):
             st.session_state.debts.append({
                 "name": debt_name,
                 "balance": debt_balance,
                 "rate": debt_rate,
-                "payment": debt_payment
+                "payment": debt_payment,
+                "currency": debt_currency
             })
             st.success("Debt added!")
     
@@ -299,32 +454,34 @@ with tab6:
                            "Avalanche (highest interest first)"],
                           horizontal=True)
         
-        # Calculate payoff timeline (simplified)
-        payoff_data = []
-        for debt in st.session_state.debts:
-            months = int(debt['balance'] / debt['payment'])
-            interest = debt['balance'] * (debt['rate']/100) * (months/12)
-            payoff_data.append({
-                "Debt": debt['name'],
-                "Months": months,
-                "Interest": interest,
-                "Payment": debt['payment']
-            })
+        # Calculate payoff timeline (simplified), in the reporting currency
+        debts_df = st.session_state.frames.get("debts", st.session_state.debts)
+        factors = fx.factors(debts_df['currency'], base_currency)
+        balance = debts_df['balance'].to_numpy()
+        payment = debts_df['payment'].to_numpy()
+        months = np.floor_divide(balance, payment, out=np.full(len(balance), np.nan), where=payment > 0)
+        interest = balance * (debts_df['rate'].to_numpy(dtype=float)/100) * (months/12)
+        payoff_df = frame_from_columns("payoff", {
+            "Debt": debts_df['name'],
+            "Months": months,
+            "Balance": balance * factors,
+            "Interest": interest * factors,
+            "Payment": payment * factors
+        })
         
         # Sort by selected strategy
         if "Avalanche" in strategy:
-            payoff_data.sort(key=lambda x: -x['Interest'])
+            payoff_df = payoff_df.sort_values('Interest', ascending=False, ignore_index=True)
         else:
-            payoff_data.sort(key=lambda x: x['balance'])
-        
-        payoff_df = pd.DataFrame(payoff_data)
+            payoff_df = payoff_df.sort_values('Balance', ignore_index=True)
         
         # Display results
         st.subheader("Payoff Timeline")
         st.dataframe(payoff_df.style.format({
-            'Interest': '€{:.2f}',
-            'Payment': '€{:.2f}'
-        }), use_container_width=True)
+            'Balance': money,
+            'Interest': money,
+            'Payment': money
+        }, na_rep="n/a"), use_container_width=True)
         
         # Visual payoff plan
         fig = px.bar(payoff_df, x='Debt', y='Months', color='Interest',
@@ -339,7 +496,7 @@ with tab7:
     
     # Investment entry form
     with st.expander("Add Investment"):
-        cols = st.columns([2,1,1,1,1])
+        cols = st.columns([2,1,1,1,1,1])
         with cols[0]: 
             ticker = st.text_input("Ticker/Name", key="inv_ticker")
         with cols[1]: 
@@ -349,6 +506,8 @@ with tab7:
         with cols[3]: 
             current = st.number_input("Current Price", min_value=0.0, key="inv_current")
         with cols[4]: 
+            inv_currency = st.selectbox("Currency", currency_options, key="inv_currency")
+        with cols[5]: 
             st.write("")  # Spacer
             st.write("")  # Spacer
             if st.button("Add", key="add_investment"):
@@ -356,28 +515,38 @@ with tab7:
                     "ticker": ticker, 
                     "shares": shares, 
                     "cost": cost, 
-                    "current": current
+                    "current": current,
+                    "currency": inv_currency
                 })
                 st.success("Investment added!")
     
     # Portfolio performance
     if st.session_state.investments:
-        portfolio_df = pd.DataFrame(st.session_state.investments)
-        portfolio_df['Value'] = portfolio_df['shares'] * portfolio_df['current']
-        portfolio_df['Cost'] = portfolio_df['shares'] * portfolio_df['cost']
-        portfolio_df['Gain'] = portfolio_df['Value'] - portfolio_df['Cost']
-        portfolio_df['Gain%'] = (portfolio_df['Gain'] / portfolio_df['Cost']) * 100
+        portfolio = st.session_state.portfolio
+        portfolio.sync(st.session_state.investments)
+        
+        # Live prices replace the typed-in "Current Price" when a feed is configured
+        price_feed = get_price_feed()
+        if price_feed:
+            if st.button("Refresh Prices", key="refresh_prices"):
+                price_feed.clear()
+            try:
+                portfolio.set_prices(price_feed.get_prices(portfolio.tickers))
+            except (requests.exceptions.RequestException, OSError, ValueError) as e:
+                st.error(f"Error fetching prices: {e}")
+        
+        portfolio_df = portfolio.to_frame(fx, base_currency)
         
         # Summary metrics
-        total_value = portfolio_df['Value'].sum()
-        total_gain = portfolio_df['Gain'].sum()
-        total_cost = portfolio_df['Cost'].sum()
+        total_value, total_cost = portfolio.totals(fx, base_currency)
+        total_gain = total_value - total_cost
+        gain_pct = total_gain / total_cost * 100 if total_cost else None
         
         col1, col2, col3 = st.columns(3)
-        col1.metric("Total Portfolio Value", f"€{total_value:,.2f}")
-        col2.metric("Total Invested", f"€{total_cost:,.2f}")
-        col3.metric("Total Gain/Loss", f"€{total_gain:,.2f}", 
-                   f"{total_gain/total_cost*100:.1f}%")
+        col1.metric("Total Portfolio Value", money(total_value))
+        col2.metric("Total Invested", money(total_cost))
+        col3.metric("Total Gain/Loss", money(total_gain), 
+                   f"{gain_pct:.1f}%" if gain_pct is not None else None)
         
         # Allocation pie chart
         st.subheader("Asset Allocation")
@@ -388,11 +557,11 @@ with tab7:
         # Performance table
         st.subheader("Investment Performance")
         st.dataframe(portfolio_df.style.format({
-            'Value': '€{:.2f}',
-            'Cost': '€{:.2f}',
-            'Gain': '€{:.2f}',
+            'Value': money,
+            'Cost': money,
+            'Gain': money,
             'Gain%': '{:.1f}%'
-        }), use_container_width=True)
+        }, na_rep="n/a"), use_container_width=True)
     else:
         st.info("Add your investments to track performance")
 
@@ -404,48 +573,89 @@ with tab8:
     with st.expander("Add Assets"):
         new_asset = st.text_input("Asset Description", key="asset_desc")
         asset_value = st.number_input("Value", min_value=0, key="asset_value")
+        asset_currency = st.selectbox("Currency", currency_options, key="asset_currency")
         if st.button("Add Asset", key="add_asset"):
             st.session_state.assets.append({
                 "description": new_asset, 
-                "value": asset_value
+                "value": asset_value,
+                "currency": asset_currency
             })
     
     with st.expander("Add Liabilities"):
         new_liability = st.text_input("Liability Description", key="liability_desc")
         liability_value = st.number_input("Amount Owed", min_value=0, key="liability_value")
+        liability_currency = st.selectbox("Currency", currency_options, key="liability_currency")
         if st.button("Add Liability", key="add_liability"):
             st.session_state.liabilities.append({
                 "description": new_liability, 
-                "value": liability_value
+                "value": liability_value,
+                "currency": liability_currency
             })
     
     # Net worth calculation
-    total_assets = sum(a['value'] for a in st.session_state.assets)
-    total_liabilities = sum(l['value'] for l in st.session_state.liabilities)
+    assets_df = st.session_state.frames.get("assets", st.session_state.assets)
+    liabilities_df = st.session_state.frames.get("liabilities", st.session_state.liabilities)
+    asset_values = to_base(assets_df)
+    liability_values = to_base(liabilities_df)
+    total_assets = asset_values.sum()
+    total_liabilities = liability_values.sum()
     net_worth = total_assets - total_liabilities
     
     # Display metrics
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Assets", f"€{total_assets:,.2f}")
-    col2.metric("Total Liabilities", f"€{total_liabilities:,.2f}")
-    col3.metric("Net Worth", f"€{net_worth:,.2f}", 
+    col1.metric("Total Assets", money(total_assets))
+    col2.metric("Total Liabilities", money(total_liabilities))
+    col3.metric("Net Worth", money(net_worth), 
                delta_color="inverse" if net_worth < 0 else "normal")
     
+    # Net worth history (one snapshot per day, only when the totals change),
+    # stored in DEFAULT_CURRENCY so switching the reporting currency keeps it consistent;
+    # nothing is recorded while any of the amounts involved lacks a real FX rate
+    history, user_id = networth_store()
+    storage_rate = fx.rate(DEFAULT_CURRENCY, base_currency)
+    if st.session_state.assets or st.session_state.liabilities:
+        unconverted = fx.unconverted & {DEFAULT_CURRENCY, base_currency, *assets_df['currency'].unique(),
+                                        *liabilities_df['currency'].unique()}
+        if unconverted:
+            st.info(f"Net worth history is paused until FX rates are available for {', '.join(sorted(unconverted))}")
+        else:
+            changed = history.record(user_id, total_assets / storage_rate, total_liabilities / storage_rate)
+            if changed and history.directory:
+                try:
+                    history.save(user_id)
+                except OSError as e:
+                    st.warning(f"Could not save net worth history: {e}")
+    
+    if history.nbytes(user_id):
+        st.subheader("Net Worth History")
+        col1, col2 = st.columns(2)
+        with col1:
+            period = st.selectbox("Period", ["1 year", "5 years", "All"], index=1, key="history_period")
+        with col2:
+            frequency = st.selectbox("Frequency", ["Monthly", "Weekly", "Daily"], key="history_freq")
+        
+        years = {"1 year": 1, "5 years": 5}.get(period)
+        start = (datetime.today() - timedelta(days=365 * years)).date() if years else None
+        freq = {"Monthly": "M", "Weekly": "W", "Daily": "D"}[frequency]
+        history_df = history.query(user_id, start=start, freq=freq).dropna()
+        history_df[['Assets', 'Liabilities', 'Net Worth']] *= storage_rate
+        fig = px.line(history_df, x='Date', y=['Assets', 'Liabilities', 'Net Worth'],
+                      title="Net Worth Over Time")
+        st.plotly_chart(fig, use_container_width=True)
+    
     # Asset/Liability breakdown
     if st.session_state.assets or st.session_state.liabilities:
         st.subheader("Breakdown")
         
         # Assets visualization
         if st.session_state.assets:
-            assets_df = pd.DataFrame(st.session_state.assets)
-            fig = px.pie(assets_df, values='value', names='description', 
+            fig = px.pie(assets_df.assign(value=asset_values), values='value', names='description', 
                          title="Asset Composition")
             st.plotly_chart(fig, use_container_width=True)
         
         # Liabilities visualization
         if st.session_state.liabilities:
-            liabilities_df = pd.DataFrame(st.session_state.liabilities)
-            fig = px.bar(liabilities_df, x='description', y='value', 
+            fig = px.bar(liabilities_df.assign(value=liability_values), x='description', y='value', 
                         title="Liabilities Breakdown")
             st.plotly_chart(fig, use_container_width=True)
     else:
@@ -456,6 +666,13 @@ with tab9:
     st.header("❤️ Financial Health Check")
     
     if total_summary:
+        # Start computing the action plans for this data snapshot in the background
+        plan_store = get_plan_store()
+        plan_debts = debts_in_base(st.session_state.frames.get("debts", st.session_state.debts))
+        plans_job = (snapshot_key("plans", total_summary, plan_debts, base_currency, source_rate),
+                     compute_plans, total_summary, plan_debts, source_rate)
+        plans_future = plan_store.submit(*plans_job)
+        
         # Calculate key ratios
         savings_rate = (total_summary['savings'] / total_summary['totalIncome']) * 100
         expense_ratio = (total_summary['totalExpenses'] / total_summary['totalIncome']) * 100
@@ -478,8 +695,9 @@ with tab9:
         
         # Debt-to-income ratio
         if st.session_state.debts:
-            total_debt_payments = sum(d['payment'] for d in st.session_state.debts)
-            dti_ratio = (total_debt_payments / total_summary['totalIncome']) * 100
+            debts_df = st.session_state.frames.get("debts", st.session_state.debts)
+            total_debt_payments = to_base(debts_df, 'payment').sum()
+            dti_ratio = (total_debt_payments / (total_summary['totalIncome'] * source_rate)) * 100
             st.metric("Debt-to-Income Ratio", f"{dti_ratio:.1f}%",
                      "Good" if dti_ratio < 35 else "High")
         
@@ -513,6 +731,185 @@ with tab9:
             - Explore wealth-building opportunities
             - Consider professional financial advice
             """)
+        
+        # Interactive action buttons
+        st.markdown("### Take Action Today")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            if st.button("📊 Get Personalized Savings Plan", key="savings_button", 
+                       use_container_width=True):
+                st.session_state.show_savings_plan = True
+            
+            if st.button("💸 Debt Reduction Strategy", key="debt_button", 
+                       use_container_width=True):
+                st.session_state.show_debt_strategy = True
+                
+        with col2:
+            if st.button("🔍 Find Expense Optimization", key="expense_button", 
+                       use_container_width=True):
+                st.session_state.show_expense_optimization = True
+            
+            if st.button("🎯 Set Financial Goals", key="goals_button", 
+                       use_container_width=True):
+                st.session_state.show_goal_setter = True
+        
+        # Panels only look up the precomputed plans; they wait only if the worker is still busy
+        panels = ["show_savings_plan", "show_debt_strategy", "show_expense_optimization", "show_goal_setter"]
+        plans = None
+        if any(st.session_state.get(panel, False) for panel in panels):
+            with st.spinner("Preparing your plans..."):
+                try:
+                    plans = plans_future.result()
+                except Exception as e:
+                    # A failed job stays in the store, and is started again only on request
+                    st.error(f"Couldn't prepare your plans: {e}")
+                    if st.button("Retry", key="retry_plans"):
+                        plan_store.submit(*plans_job, retry=True)
+                        st.rerun()
+        
+        if plans is not None and st.session_state.get("show_savings_plan", False):
+            st.markdown("---")
+            st.subheader("Your Personalized Savings Plan")
+            
+            plan = plans['savings_plan']
+            col1, col2 = st.columns(2)
+            col1.metric(f"Target Savings ({SAVINGS_TARGET}% of income)", money(plan['target']))
+            col2.metric("Monthly Gap", money(plan['gap']))
+            if plan['gap'] > 0:
+                st.markdown("Spread across your categories, closing the gap means these monthly cuts:")
+                st.dataframe(
+                    plan['cuts'].style.format({'Spending': money, 'Suggested Cut': money}),
+                    hide_index=True, use_container_width=True
+                )
+            else:
+                st.success("You already meet the recommended savings rate!")
+            
+            # AI recommendations are requested (a paid call) only once the plan is opened,
+            # then generated in the background and shared by every session with this snapshot
+            if HUGGINGFACE_API_TOKEN:
+                advice_job = (snapshot_key("advice", total_summary), generate_savings_recommendations, total_summary)
+                advice_future = plan_store.submit(*advice_job)
+                if advice_future.done():
+                    try:
+                        recommendations = advice_future.result()
+                        st.markdown(recommendations)
+                        
+                        # Download option
+                        st.download_button(
+                            label="Download Savings Plan",
+                            data=recommendations,
+                            file_name="my_savings_plan.md",
+                            mime="text/markdown",
+                        )
+                    except Exception as e:
+                        st.error(f"Couldn't generate recommendations: {e}")
+                        if st.button("Retry AI Recommendations", key="retry_advice"):
+                            plan_store.submit(*advice_job, retry=True)
+                            st.rerun()
+                else:
+                    st.info("AI recommendations are still being generated. They will appear on the next refresh.")
+        
+        if plans is not None and st.session_state.get("show_debt_strategy", False):
+            st.markdown("---")
+            st.subheader("Debt Reduction Strategy")
+            
+            if st.session_state.debts:
+                method = st.radio(
+                    "Choose your debt reduction strategy:",
+                    ["Avalanche Method (Highest interest first)", "Snowball Method (Smallest balance first)"],
+                    key="debt_method"
+                )
+                order = plans['debt_orders']["snowball" if "Snowball" in method else "avalanche"]
+                
+                st.markdown("### Your Debt Payoff Order")
+                st.dataframe(
+                    order.style.format({
+                        'Balance': money, 'Payment': money, 'Rate': '{:.2f}%', 'Payoff Years': '{:.0f}'
+                    }, na_rep="n/a"),
+                    column_config={
+                        "Paid per Year %": st.column_config.ProgressColumn(
+                            "Paid per Year", min_value=0, max_value=100, format="%.0f%%"
+                        )
+                    },
+                    hide_index=True, use_container_width=True
+                )
+            else:
+                st.success("Great news! You don't have any debts recorded in the system.")
+        
+        if plans is not None and st.session_state.get("show_expense_optimization", False):
+            st.markdown("---")
+            st.subheader("Expense Optimization Opportunities")
+            
+            if 'spending_by_category' in total_summary:
+                tips = plans['expense_tips']
+                for category, amount, potential in tips['tips'].head(TOP_TIPS).itertuples(index=False, name=None):
+                    st.markdown(f"""
+                    <div style="background-color: rgba(0,0,0,0.05); padding: 15px; border-radius: 10px; margin: 10px 0;">
+                        <h4>{category}</h4>
+                        <p>Current spending: {money(amount)}</p>
+                        <p>Potential monthly savings: <span style="color: green; font-weight: bold;">{money(potential)}</span></p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                st.markdown(f"""
+                <div style="text-align: center; margin: 20px 0;">
+                    <h3>Total Annual Impact</h3>
+                    <h2 style="color: green;">{money(tips['annual_impact'])}</h2>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                if st.button("Get Detailed Savings Tips", key="tips_button"):
+                    st.session_state.show_detailed_tips = True
+                if st.session_state.get("show_detailed_tips", False):
+                    st.dataframe(
+                        tips['tips'].style.format({'Amount': money, 'Potential Savings': money}),
+                        hide_index=True, use_container_width=True
+                    )
+            else:
+                st.warning("No spending by category data available.")
+        
+        if plans is not None and st.session_state.get("show_goal_setter", False):
+            st.markdown("---")
+            st.subheader("Set Your Financial Goals")
+            
+            suggestions = plans['goal_suggestions']
+            goal_type = st.selectbox("Goal Type", GOAL_TYPES, key="health_goal_type")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                goal_amount = st.number_input(f"Target Amount ({base_currency})", min_value=0.0,
+                                              value=round(float(suggestions.loc[goal_type, 'Target']), 2),
+                                              key=f"health_goal_amount_{goal_type}")
+            with col2:
+                goal_years = st.number_input("Target Years", min_value=0.1, max_value=50.0, value=5.0,
+                                             step=0.5, key="health_goal_years")
+            
+            monthly_contribution = goal_amount / (goal_years * 12)
+            income = total_summary['totalIncome'] * source_rate
+            income_share = f"{monthly_contribution / income * 100:.1f}%" if income else "n/a"
+            
+            st.markdown(f"""
+            <div style="background-color: rgba(0,0,0,0.05); padding: 20px; border-radius: 10px; margin: 15px 0; text-align: center;">
+                <h3>To reach your goal</h3>
+                <h2 style="margin: 10px 0;">You need to save <span style="color: #3498db;">{money(monthly_contribution)}</span> monthly</h2>
+                <p>That's {income_share} of your current income</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            st.caption("Suggested targets and the monthly saving they need by horizon")
+            st.dataframe(suggestions.style.format(money), use_container_width=True)
+            
+            if st.button("Save This Goal", key="save_goal_button"):
+                st.session_state.goals.append({
+                    "name": goal_type,
+                    "target": goal_amount,
+                    "saved": 0,
+                    "date": (datetime.today() + timedelta(days=int(goal_years * 365.25))).date(),
+                    "currency": base_currency
+                })
+                st.success("Goal saved! Track it in the Goals tab.")
     else:
         st.warning("Please load financial data in the Overview tab first")
 
@@ -522,6 +919,54 @@ if st.sidebar.button("Refresh Data"):
     st.cache_data.clear()
     st.rerun()
 
+# Bulk export: datasets are streamed chunk by chunk into a temporary file, which
+# is read only when the download is requested and deleted right after. Amounts are
+# in the reporting currency, like the tabs they come from
+with st.sidebar.expander("Export Data"):
+    export_sources = {
+        "Transactions": lambda: transactions_chunks(QUARKUS_API),
+        "Spending by Category": lambda: spending_chunks(spending, source_rate) if spending else None,
+        "Forecast": lambda: forecast_chunks(
+            total_summary, st.session_state.forecast_months,
+            st.session_state.income_growth, st.session_state.expense_growth, source_rate
+        ) if total_summary else None,
+        "Debt Schedule": lambda: debt_schedule_chunks(
+            debts_in_base(st.session_state.frames.get("debts", st.session_state.debts))
+        ) if st.session_state.debts else None,
+        "Portfolio Positions": lambda: frame_chunks(
+            st.session_state.portfolio.to_frame(fx, base_currency)
+        ) if st.session_state.investments else None,
+        "Net Worth History": lambda: networth_chunks(*networth_store())
+    }
+    export_dataset = st.selectbox("Dataset", list(export_sources), key="export_dataset")
+    export_format = st.selectbox("Format", list(FORMATS), key="export_format")
+    
+    if st.button("Prepare Export", key="prepare_export"):
+        chunks = export_sources[export_dataset]()
+        if chunks is None:
+            st.warning(f"No {export_dataset.lower()} data to export yet")
+        else:
+            previous = st.session_state.get("export")
+            if previous is not None:
+                previous.remove()
+            _, mime, extension = FORMATS[export_format]
+            export = TempExport(extension, f"{export_dataset.lower().replace(' ', '_')}"
+                                           f"_{datetime.now().strftime('%Y%m%d')}.{extension}", mime)
+            try:
+                with st.spinner("Exporting..."), open(export.path, "wb") as f:
+                    write_export(chunks, export_format, f)
+                st.session_state.export = export
+            except (requests.exceptions.RequestException, OSError, ValueError, ImportError) as e:
+                export.remove()
+                st.session_state.export = None
+                st.error(f"Export failed: {e}")
+    
+    export = st.session_state.get("export")
+    if export is not None and export.available:
+        # Deferred: Streamlit calls read_once only when the button is clicked
+        st.download_button("Download Export", data=export.read_once, file_name=export.file_name,
+                           mime=export.mime, key="download_export")
+
 st.sidebar.markdown("### About")
 st.sidebar.info("""
 This comprehensive financial dashboard helps you:
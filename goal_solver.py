@@ -0,0 +1,84 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Vectorized goal planning: how much each goal needs per month, how the
+# available savings are split between goals, and when each goal completes
+# if savings follow the cash flow forecast.
+
+HORIZON_MONTHS = 600  # Goals not reached within 50 years get no completion date
+
+def project_cash_flow(income, expenses, income_growth, expense_growth, months):
+    """Monthly income, expenses and savings with compound monthly growth (in %)"""
+    step = np.arange(months)
+    income = income * (1 + income_growth / 100) ** step
+    expenses = expenses * (1 + expense_growth / 100) ** step
+    return income, expenses, income - expenses
+
+def months_until(deadlines, today=None):
+    """Whole calendar months from `today` to each deadline, at least one"""
+    today = np.datetime64(today or date.today(), "M")
+    ends = np.asarray(deadlines, dtype="datetime64[M]")
+    return np.maximum((ends - today).astype(np.int64), 1)
+
+def allocate_savings(required, remaining, budget):
+    """Split a monthly budget across goals
+
+    Every goal gets its required contribution when the budget allows, with
+    any surplus shared by remaining amount. When the budget is short, each
+    goal gets the same fraction of what it requires.
+    """
+    total_required = required.sum()
+    if total_required >= budget:
+        return required * (budget / total_required) if total_required else np.zeros_like(required)
+    total_remaining = remaining.sum()
+    if not total_remaining:
+        return required.copy()
+    return required + (budget - total_required) * remaining / total_remaining
+
+def solve_goals(targets, saved, deadlines, monthly_savings, today=None):
+    """Required and allocated contributions, completion date and feasibility for every goal
+
+    `monthly_savings` is the forecast amount available for goals each month,
+    starting this month. Each goal keeps the share of it allocated this month.
+    """
+    targets = np.asarray(targets, dtype=float)
+    saved = np.asarray(saved, dtype=float)
+    months_left = months_until(deadlines, today)
+    remaining = np.maximum(targets - saved, 0)
+    required = remaining / months_left
+
+    horizon = max(HORIZON_MONTHS, int(months_left.max(initial=0)))
+    # Hold the last forecast month flat beyond the projection period
+    forecast = np.asarray(monthly_savings, dtype=float)[:horizon]
+    savings = np.full(horizon, forecast[-1] if len(forecast) else 0.0)
+    savings[:len(forecast)] = forecast
+    savings = np.maximum(savings, 0)
+    cumulative = np.cumsum(savings)
+
+    budget = savings[0]
+    allocated = allocate_savings(required, remaining, budget)
+    share = np.divide(allocated, budget, out=np.zeros_like(allocated), where=budget > 0)
+
+    # First month in which the goal's share of cumulative savings covers what remains
+    needed = np.divide(remaining, share, out=np.full_like(remaining, np.inf), where=share > 0)
+    months_needed = np.searchsorted(cumulative, needed - 1e-9) + 1
+    months_needed = np.where(remaining > 0, months_needed, 0)
+    reachable = months_needed <= horizon
+
+    this_month = np.datetime64(today or date.today(), "M")
+    completion = (this_month + months_needed).astype("datetime64[D]")
+    completion[~reachable] = np.datetime64("NaT", "D")
+
+    at_deadline = share * cumulative[np.minimum(months_left, horizon) - 1]
+    feasibility = np.divide(at_deadline, remaining, out=np.ones_like(remaining), where=remaining > 0)
+    feasibility = np.clip(feasibility, 0, 1)
+
+    return pd.DataFrame({
+        "Required Monthly": required,
+        "Allocated Monthly": allocated,
+        "Projected Completion": pd.to_datetime(completion),
+        "Feasibility": feasibility,
+        "On Track": feasibility >= 0.999
+    })
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Health Check action plans, computed once per data snapshot on a background
+# thread so opening a panel is a lookup. A snapshot is identified by a
+# fingerprint of the data the plans are built from; new data means a new key.
+
+SAVINGS_TARGET = 20  # Recommended savings rate, % of income
+TIP_SHARE = 0.10  # Assumed savings potential per spending category
+TOP_TIPS = 3
+GOAL_TYPES = ["Emergency Fund", "Major Purchase", "Retirement", "Debt Freedom", "Custom Goal"]
+GOAL_YEARS = [1, 2, 3, 5, 10]
+
+def snapshot_key(*parts):
+    """Fingerprint of frames and JSON-shaped values, stable across reruns and sessions"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(",".join(map(str, part.columns)).encode("utf-8"))
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def savings_plan(income, savings, spending):
+    """Gap to the target savings rate, closed by cuts proportional to each category's spending"""
+    target = income * SAVINGS_TARGET / 100
+    gap = max(0.0, target - savings)
+    total = spending.sum()
+    cuts = spending * (gap / total) if total else spending * 0
+    return {
+        "target": target,
+        "gap": gap,
+        "cuts": pd.DataFrame({
+            "Category": spending.index,
+            "Spending": spending.to_numpy(),
+            "Suggested Cut": cuts.to_numpy()
+        }).sort_values("Suggested Cut", ascending=False, ignore_index=True)
+    }
+
+def debt_orders(debts):
+    """Payoff order for the avalanche (highest rate first) and snowball (smallest balance first) methods"""
+    balance = debts["balance"].to_numpy(dtype=float)
+    yearly = debts["payment"].to_numpy(dtype=float) * 12
+    paid_share = np.divide(yearly * 100, balance, out=np.full(len(debts), 100.0), where=balance > 0)
+    years = np.divide(balance, yearly, out=np.full(len(debts), np.nan), where=yearly > 0)
+    order = pd.DataFrame({
+        "Debt": debts["name"].to_numpy(),
+        "Balance": balance,
+        "Rate": debts["rate"].to_numpy(dtype=float),
+        "Payment": debts["payment"].to_numpy(dtype=float),
+        "Paid per Year %": np.minimum(paid_share, 100),
+        "Payoff Years": np.maximum(np.floor(years), 1)
+    })
+    orders = {
+        "avalanche": order.sort_values("Rate", ascending=False, kind="stable", ignore_index=True),
+        "snowball": order.sort_values("Balance", kind="stable", ignore_index=True)
+    }
+    for ordered in orders.values():
+        ordered.insert(0, "Priority", np.arange(1, len(ordered) + 1))
+    return orders
+
+def expense_tips(spending):
+    """Every category's potential saving, largest first, and the yearly impact of the top ones"""
+    tips = pd.DataFrame({
+        "Category": spending.index,
+        "Amount": spending.to_numpy(),
+        "Potential Savings": spending.to_numpy() * TIP_SHARE
+    }).sort_values("Amount", ascending=False, ignore_index=True)
+    return {"tips": tips, "annual_impact": tips["Potential Savings"].head(TOP_TIPS).sum() * 12}
+
+def goal_suggestions(expenses, total_debt):
+    """Suggested target per goal type and the monthly saving it needs over each horizon"""
+    targets = np.array([
+        6 * expenses,  # Six months of expenses
+        10000.0,
+        300 * expenses,  # 25 years of expenses (4% withdrawal rule)
+        total_debt,
+        10000.0
+    ])
+    months = np.array(GOAL_YEARS) * 12
+    monthly = targets[:, None] / months[None, :]
+    table = pd.DataFrame(monthly, index=GOAL_TYPES, columns=[f"{y} yr" for y in GOAL_YEARS])
+    table.insert(0, "Target", targets)
+    return table
+
+def compute_plans(total_summary, debts, rate=1.0):
+    """Every Health Check plan variant for one snapshot, with amounts scaled by `rate`"""
+    income = total_summary.get("totalIncome", 0) * rate
+    expenses = total_summary.get("totalExpenses", 0) * rate
+    savings = total_summary.get("savings", 0) * rate
+    spending = pd.Series(total_summary.get("spending_by_category", {}), dtype="float64") * rate
+    return {
+        "savings_plan": savings_plan(income, savings, spending),
+        "debt_orders": debt_orders(debts),
+        "expense_tips": expense_tips(spending),
+        "goal_suggestions": goal_suggestions(expenses, float(debts["balance"].sum()))
+    }
+
+def _failed(future):
+    return future.done() and (future.cancelled() or future.exception() is not None)
+
+class PlanStore:
+    """Runs plan jobs on worker threads and keeps the results of recent snapshots"""
+
+    def __init__(self, max_workers=2, max_snapshots=64):
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="health-plans")
+        self._futures = OrderedDict()
+        self._max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, retry=False):
+        """Future for `key`, started unless it is already computed or in progress
+
+        A failed future is kept, so its error can be shown, until a caller
+        asks to `retry` it.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not (retry and _failed(future)):
+                self._futures.move_to_end(key)
+                return future
+            future = self._futures[key] = self._executor.submit(fn, *args)
+            self._futures.move_to_end(key)
+            # Forget the least recently used snapshots; sessions holding their futures keep them
+            while len(self._futures) > self._max_snapshots:
+                self._futures.popitem(last=False)
+            return future
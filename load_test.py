@@ -0,0 +1,438 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+from benchmark_dashboards import FAILURE_BANNERS, HERE, RESULTS_DIR
+from stub_servers import inference_stub, quarkus_stub
+
+# Drives a real `streamlit run` server, pinned to the CPUs a pod would get,
+# with N concurrent websocket clients that behave like browser tabs. Reports
+# rerun latency, the server memory one more session costs, and how many users
+# one server process can hold.
+# Usage: python load_test.py --sessions 1 10 25 50 --cpus 1 --pod-memory 2048 --latency-budget 500
+
+APP = "financial_dashboard.py"
+SERVER_TIMEOUT = 60
+RERUN_TIMEOUT = 120
+SAMPLE_INTERVAL = 0.1  # Seconds between server memory samples
+
+FINISHED_EARLY = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+COMPILE_ERROR = ForwardMsg.ScriptFinishedStatus.FINISHED_WITH_COMPILE_ERROR
+
+def resident_memory(pid):
+    """Resident set size of a process in bytes, or None where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class StreamlitServer:
+    """`streamlit run` in a child process with its own secrets, optionally pinned to `cpus` cores"""
+
+    def __init__(self, app, secrets, cpus=None):
+        self.app = os.path.join(HERE, app)
+        self.secrets = secrets
+        self.cpus = cpus
+        self.port = _free_port()
+        self.url = f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def __enter__(self):
+        self._dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self._dir.name, ".streamlit"))
+        with open(os.path.join(self._dir.name, ".streamlit", "secrets.toml"), "w") as f:
+            f.writelines(f"{key} = {json.dumps(value)}\n" for key, value in self.secrets.items())
+        self._log = open(os.path.join(self._dir.name, "server.log"), "w+")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", self.app, "--server.headless=true",
+             f"--server.port={self.port}", "--server.fileWatcherType=none",
+             "--browser.gatherUsageStats=false"],
+            cwd=self._dir.name, stdout=self._log, stderr=subprocess.STDOUT
+        )
+        if self.cpus and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(self.process.pid, server_cores(self.cpus))
+        deadline = time.monotonic() + SERVER_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self._log.seek(0)
+                raise RuntimeError(f"Streamlit server exited: {self._log.read()[-2000:]}")
+            try:
+                if requests.get(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1).ok:
+                    return self
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError(f"Streamlit server did not start within {SERVER_TIMEOUT}s")
+
+    def rss(self):
+        return resident_memory(self.process.pid)
+
+    def connect(self):
+        return connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self._log.close()
+        self._dir.cleanup()
+
+def server_cores(cpus):
+    """The first `cpus` cores this process may use; the load generator keeps the rest"""
+    cores = sorted(os.sched_getaffinity(0))
+    return set(cores[:cpus])
+
+class Session:
+    """One browser tab: a websocket to the server, rerunning the script with widget changes
+
+    Widgets are addressed by their `key`. Like a browser, the session sends
+    every value it has set so far on each rerun; button clicks are sent once.
+    """
+
+    def __init__(self, websocket):
+        self._ws = websocket
+        self._widgets, self._ids = {}, {}
+        self._values = {}
+
+    def run(self, **changes):
+        """Rerun with `changes` ({key: value}); returns (seconds, failure messages)"""
+        triggers = {}
+        for key, value in changes.items():
+            kind = self._widgets.get(key)
+            if kind is None:
+                return 0.0, [f"no widget with key {key!r}"]
+            (triggers if kind == "button" else self._values)[key] = value
+
+        message = BackMsg()
+        message.rerun_script.SetInParent()
+        for key, value in {**self._values, **triggers}.items():
+            if key in self._widgets:
+                message.rerun_script.widget_states.widgets.append(self._widget_state(key, value))
+        start = time.perf_counter()
+        self._ws.send(message.SerializeToString())
+        failures = self._receive()
+        return time.perf_counter() - start, failures
+
+    def _widget_state(self, key, value):
+        kind, widget_id = self._widgets[key], self._ids[key]
+        state = WidgetState(id=widget_id)
+        if kind == "button":
+            state.trigger_value = bool(value)
+        elif kind == "number_input":
+            state.double_value = float(value)
+        elif kind == "slider":
+            state.double_array_value.data[:] = [float(value)]
+        else:  # text_input, data editor (JSON edits)
+            state.string_value = value
+        return state
+
+    def _receive(self):
+        """Read forward messages until the script run ends, noting widgets and failures"""
+        widgets, ids, failures = {}, {}, []
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(self._ws.recv(timeout=RERUN_TIMEOUT))
+            kind = message.WhichOneof("type")
+            if kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    failures.append(f"{element.exception.type}: {element.exception.message}")
+                    continue
+                if (element_type == "alert" and element.alert.format == Alert.ERROR
+                        and element.alert.body.startswith(FAILURE_BANNERS)):
+                    failures.append(element.alert.body)
+                    continue
+                widget_id = getattr(getattr(element, element_type), "id", "")
+                # Widget ids end with the widget's key: "$$ID-<hash>-<key>"
+                key = widget_id.split("-", 2)[2] if widget_id.count("-") >= 2 else None
+                if key and key != "None":
+                    widgets[key], ids[key] = element_type, widget_id
+            elif kind == "script_finished":
+                if message.script_finished == FINISHED_EARLY:
+                    continue
+                if message.script_finished == COMPILE_ERROR:
+                    failures.append("script failed to compile")
+                break
+        # Like a browser, forget values of widgets that came back as new widgets
+        self._values = {key: value for key, value in self._values.items() if ids.get(key) == self._ids.get(key)}
+        self._widgets, self._ids = widgets, ids
+        return failures
+
+# Interactions, each one rerun: (action, relative weight)
+def rerun(session, rng):
+    return session.run()
+
+def edit_budget(session, rng):
+    edits = {"edited_rows": {"0": {"Budget": rng.randint(100, 5000)}}, "added_rows": [], "deleted_rows": []}
+    return session.run(budget_editor=json.dumps(edits))
+
+def change_forecast(session, rng):
+    return session.run(forecast_months=rng.choice([6, 12, 24]))
+
+def add_goal(session, rng):
+    return session.run(goal_name="Load goal", target_amount=5000, add_goal=True)
+
+def add_debt(session, rng):
+    return session.run(debt_name="Load debt", debt_balance=2500, debt_rate=7.5, debt_payment=150,
+                       add_debt=True)
+
+def add_investment(session, rng):
+    return session.run(inv_ticker="LOAD", inv_shares=10, inv_cost=100, inv_current=110, add_investment=True)
+
+def add_asset(session, rng):
+    return session.run(asset_desc="Load asset", asset_value=1000, add_asset=True)
+
+def edit_emergency_fund(session, rng):
+    return session.run(emergency_fund=rng.randint(1000, 20000))
+
+INTERACTIONS = [
+    (rerun, 30),
+    (edit_budget, 15),
+    (change_forecast, 10),
+    (add_goal, 10),
+    (add_debt, 10),
+    (add_investment, 10),
+    (add_asset, 10),
+    (edit_emergency_fund, 5)
+]
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run_session(session, steps, think_time, seed, start_barrier, report):
+    """One simulated user running the interaction script; failed reruns are counted, not timed"""
+    rng = random.Random(seed)
+    actions, weights = zip(*INTERACTIONS)
+    try:
+        start_barrier.wait(timeout=RERUN_TIMEOUT)
+        for _ in range(steps):
+            action = rng.choices(actions, weights)[0]
+            elapsed, failures = action(session, rng)
+            if failures:
+                report["failed"] += 1
+                report["errors"] += [f"{action.__name__}: {message}" for message in failures]
+            else:
+                report["latencies"].append(elapsed)
+            if think_time:
+                time.sleep(rng.uniform(0, 2 * think_time))
+    except threading.BrokenBarrierError:
+        report["errors"].append("session did not start in time")
+    except Exception as e:
+        report["errors"].append(repr(e))
+
+def _slope(points):
+    """Least-squares slope of (x, y) points; the mean ratio when there is a single point"""
+    if len(points) == 1:
+        x, y = points[0]
+        return y / x if x else 0
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else 0
+
+def _sample_peak(server, stop, peak):
+    while not stop.is_set():
+        rss = server.rss()
+        if rss is not None:
+            peak[0] = max(peak[0], rss)
+        stop.wait(SAMPLE_INTERVAL)
+
+def run_level(app, secrets, sessions, steps, think_time, cpus):
+    """Run `sessions` concurrent users against a fresh server and return latency and memory figures"""
+    with StreamlitServer(app, secrets, cpus) as server, contextlib.ExitStack() as connections:
+        # A first session loads the imports and fills the shared caches, so the
+        # memory figures are what each further session costs
+        with server.connect() as websocket:
+            _, warmup_failures = Session(websocket).run()
+        time.sleep(1)
+        baseline = server.rss()
+
+        clients = [Session(connections.enter_context(server.connect())) for _ in range(sessions)]
+        reports = [{"latencies": [], "errors": [], "failed": 0} for _ in clients]
+        for client, report in zip(clients, reports):
+            _, failures = client.run()
+            report["errors"] += [f"first_render: {message}" for message in failures]
+
+        barrier = threading.Barrier(sessions + 1)
+        threads = [threading.Thread(target=run_session,
+                                    args=(client, steps, think_time, seed, barrier, report))
+                   for seed, (client, report) in enumerate(zip(clients, reports))]
+        for thread in threads:
+            thread.start()
+        stop, peak = threading.Event(), [baseline or 0]
+        sampler = threading.Thread(target=_sample_peak, args=(server, stop, peak))
+        sampler.start()
+        try:
+            barrier.wait(timeout=RERUN_TIMEOUT)
+        except threading.BrokenBarrierError:
+            pass
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+        # Sessions are still connected, so their state is still held
+        final = server.rss()
+
+    latencies = [sample for r in reports for sample in r["latencies"]]
+    measured = baseline is not None and final is not None
+    errors = [f"warmup: {message}" for message in warmup_failures] + [e for r in reports for e in r["errors"]]
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "failed_reruns": sum(r["failed"] for r in reports),
+        "duration_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else None,
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "mean_ms": _ms(statistics.fmean(latencies)) if latencies else None,
+        "baseline_rss": baseline,
+        "total_session_rss": max(0, final - baseline) if measured else None,
+        "total_peak_session_rss": max(0, peak[0] - baseline) if measured else None,
+        "rss_per_session": max(0, final - baseline) / sessions if measured else None,
+        "peak_rss_per_session": max(0, peak[0] - baseline) / sessions if measured else None,
+        "errors": sorted(set(errors))
+    }
+
+def _ms(seconds):
+    return seconds * 1000 if seconds is not None else None
+
+def capacity_report(levels, pod_memory_mib, latency_budget_ms, cpus):
+    """Estimate how many concurrent users one server process with `cpus` cores can hold"""
+    pod_bytes = pod_memory_mib * 1024 * 1024
+    largest = max(levels, key=lambda level: level["sessions"])
+    measured = [level for level in levels if level["peak_rss_per_session"] is not None]
+    # Marginal cost of a session: how server memory grows with the session count
+    per_session = _slope([(level["sessions"], level["total_peak_session_rss"])
+                          for level in measured]) if measured else 0
+    per_session = max(per_session, 1)
+    process_overhead = statistics.median(level["baseline_rss"] for level in measured) if measured else 0
+    by_memory = int(max(0, pod_bytes - process_overhead) // per_session)
+
+    within_budget = [level["sessions"] for level in levels
+                     if level["p95_ms"] is not None and level["p95_ms"] <= latency_budget_ms]
+    by_latency = max(within_budget) if within_budget else 0
+    # Latency limit is only known up to the largest level we measured
+    latency_bound = by_latency < largest["sessions"]
+
+    return {
+        "pod_memory_mib": pod_memory_mib,
+        "latency_budget_ms": latency_budget_ms,
+        "cpus": cpus,
+        "process_overhead_bytes": process_overhead,
+        "bytes_per_session": per_session,
+        "users_by_memory": by_memory,
+        "users_by_latency": by_latency if latency_bound else f">={by_latency}",
+        "capacity": min(by_memory, by_latency) if latency_bound else by_memory,
+        "limited_by": "latency" if latency_bound and by_latency < by_memory else "memory"
+    }
+
+def print_report(levels, capacity, shared_cpus):
+    print(f"\n{'sessions':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>8} {'RSS/session':>12}")
+    for level in levels:
+        if level["p50_ms"] is None:
+            print(f"{level['sessions']:>8}   no successful reruns: {'; '.join(level['errors'][:3])}")
+            continue
+        rss = level["peak_rss_per_session"]
+        print(f"{level['sessions']:>8} {level['p50_ms']:>9.1f} {level['p95_ms']:>9.1f} "
+              f"{level['p99_ms']:>9.1f} {level['throughput_rps']:>8.1f} "
+              + (f"{rss / 1024 / 1024:>10.2f}Mi" if rss is not None else f"{'n/a':>12}"))
+        if level["failed_reruns"] or level["errors"]:
+            print(f"{'':>8} {level['failed_reruns']} failed rerun(s) left out: {level['errors'][0]}")
+    print(f"\nOne server process on {capacity['cpus'] or 'all'} CPU(s), pod with "
+          f"{capacity['pod_memory_mib']} MiB, p95 budget {capacity['latency_budget_ms']} ms:")
+    print(f"  users by memory:  {capacity['users_by_memory']}")
+    print(f"  users by latency: {capacity['users_by_latency']}")
+    print(f"  capacity:         {capacity['capacity']} users (limited by {capacity['limited_by']})")
+    if shared_cpus:
+        print("  note: the load generator shared the server's CPUs, so latencies are pessimistic")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test against a Streamlit server")
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 5, 10, 25],
+                        help="Concurrent session counts to test")
+    parser.add_argument("--steps", type=int, default=40, help="Interactions per session")
+    parser.add_argument("--think-time", type=float, default=0.2,
+                        help="Mean pause between interactions in seconds")
+    parser.add_argument("--categories", type=int, default=25, help="Spending categories served by the stub")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="Cores the server process is pinned to, as in the pod (0: no pinning)")
+    parser.add_argument("--pod-memory", type=int, default=2048, help="Pod memory limit in MiB")
+    parser.add_argument("--latency-budget", type=float, default=500,
+                        help="Acceptable p95 rerun latency in ms")
+    parser.add_argument("--output", help="Report file (default: bench_results/load-<timestamp>.json)")
+    args = parser.parse_args()
+
+    cpus = args.cpus if hasattr(os, "sched_setaffinity") else 0
+    shared_cpus = False
+    if cpus:
+        # The clients and stubs run here; keep them off the server's cores when there are spare ones
+        spare = set(os.sched_getaffinity(0)) - server_cores(cpus)
+        if spare:
+            os.sched_setaffinity(0, spare)
+        shared_cpus = not spare
+
+    levels = []
+    with quarkus_stub(args.categories) as quarkus, inference_stub() as inference:
+        secrets = {
+            "QUARKUS_API": quarkus.url,
+            "HUGGINGFACE_API_TOKEN": "stub-token",
+            "HUGGINGFACE_MODEL": inference.url
+        }
+        for sessions in sorted(args.sessions):
+            print(f"Running {sessions} concurrent session(s)...")
+            levels.append(run_level(APP, secrets, sessions, args.steps, args.think_time, cpus))
+
+    capacity = capacity_report(levels, args.pod_memory, args.latency_budget, cpus)
+    print_report(levels, capacity, shared_cpus)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "app": APP,
+            "steps": args.steps,
+            "think_time": args.think_time,
+            "categories": args.categories,
+            "shared_cpus": shared_cpus,
+            "levels": levels,
+            "capacity": capacity
+        }, f, indent=2, default=str)
+    print(f"\nReport saved to {output}")
+
+if __name__ == "__main__":
+    main()
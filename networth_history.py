@@ -0,0 +1,291 @@
+import os
+import struct
+import threading
+from array import array
+from datetime import date
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+# Compact time-series store for net-worth snapshots. Each user's history is
+# held as delta-encoded integer arrays (days since epoch, asset and liability
+# cents) using the narrowest dtype that fits, with a small append buffer for
+# new snapshots. Old periods are downsampled to one snapshot per month.
+# Persisted histories live one file per user, read on first use and rewritten
+# only when that user's snapshots change.
+
+FREQUENCIES = {"D": ("D", 1), "W": ("W", 1), "M": ("M", 1), "Q": ("M", 3), "Y": ("Y", 1)}
+_DTYPES = [np.int8, np.int16, np.int32, np.int64]
+_HEADER = struct.Struct("<qqqIBBB")
+_BUFFER_SIZE = 32
+
+def _day(when):
+    if when is None:
+        when = date.today()
+    return int(np.datetime64(when, "D").astype(np.int64))
+
+def _cents(amount):
+    return int(round(amount * 100))
+
+def _narrowest(deltas):
+    if not len(deltas):
+        return np.int8
+    low, high = deltas.min(), deltas.max()
+    for dtype in _DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+def _downsample(days, assets, liabilities, cutoff):
+    """Keep every snapshot from `cutoff` on and only the last of each month before it"""
+    if not len(days):
+        return days, assets, liabilities
+    months = days.astype("datetime64[D]").astype("datetime64[M]")
+    last_of_month = np.append(months[1:] != months[:-1], True)
+    keep = (days >= cutoff) | last_of_month
+    return days[keep], assets[keep], liabilities[keep]
+
+class _Column:
+    """One delta-encoded int64 column"""
+    __slots__ = ("first", "deltas")
+
+    def __init__(self, values=None):
+        values = np.asarray(values if values is not None else [], dtype=np.int64)
+        self.first = int(values[0]) if len(values) else 0
+        deltas = np.diff(values)
+        self.deltas = deltas.astype(_narrowest(deltas))
+
+    def decode(self, length):
+        if not length:
+            return np.empty(0, dtype=np.int64)
+        out = np.empty(length, dtype=np.int64)
+        out[0] = self.first
+        if length > 1:
+            np.cumsum(self.deltas, dtype=np.int64, out=out[1:])
+            out[1:] += self.first
+        return out
+
+    @property
+    def nbytes(self):
+        return self.deltas.nbytes + 8
+
+class _Series:
+    __slots__ = ("length", "days", "assets", "liabilities", "tail")
+
+    def __init__(self):
+        self.length = 0
+        self.days = _Column()
+        self.assets = _Column()
+        self.liabilities = _Column()
+        # Recent snapshots not yet packed: day, assets, liabilities
+        self.tail = (array("i"), array("q"), array("q"))
+
+    def decode(self):
+        packed = [column.decode(self.length) for column in (self.days, self.assets, self.liabilities)]
+        if not len(self.tail[0]):
+            return packed
+        return [np.concatenate([values, np.array(extra, dtype=np.int64)])
+                for values, extra in zip(packed, self.tail)]
+
+    def pack(self, days, assets, liabilities):
+        self.length = len(days)
+        self.days = _Column(days)
+        self.assets = _Column(assets)
+        self.liabilities = _Column(liabilities)
+        self.tail = (array("i"), array("q"), array("q"))
+
+    def last(self):
+        if len(self.tail[0]):
+            return self.tail[0][-1], self.tail[1][-1], self.tail[2][-1]
+        if not self.length:
+            return None
+        days, assets, liabilities = self.decode()
+        return int(days[-1]), int(assets[-1]), int(liabilities[-1])
+
+    @property
+    def nbytes(self):
+        tail = sum(buffer.itemsize * len(buffer) for buffer in self.tail)
+        return self.days.nbytes + self.assets.nbytes + self.liabilities.nbytes + tail
+
+class NetWorthHistory:
+    """Asset and liability snapshots per user, with range queries at a fixed frequency
+
+    With a `directory`, each user's history is read from its own file there
+    the first time it is needed and written back by `save`.
+    """
+
+    def __init__(self, recent_days=730, directory=None):
+        self.recent_days = recent_days
+        self.directory = directory
+        self._series = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def _path(self, user_id):
+        return os.path.join(self.directory, f"{quote(str(user_id), safe='@')}.nwh")
+
+    def _get(self, user_id, create=False):
+        """Series for `user_id`, loaded from its file on first use; call with the lock held"""
+        series = self._series.get(user_id)
+        if series is None and self.directory:
+            path = self._path(user_id)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    series = self._series[user_id] = _decode(f.read())
+        if series is None and create:
+            series = self._series[user_id] = _Series()
+        return series
+
+    def record(self, user_id, total_assets, total_liabilities, when=None):
+        """Store a snapshot; returns False when nothing changed since the last one"""
+        day, assets, liabilities = _day(when), _cents(total_assets), _cents(total_liabilities)
+        with self._lock:
+            series = self._get(user_id, create=True)
+            last = series.last()
+            if last is not None:
+                if last[1:] == (assets, liabilities) and last[0] <= day:
+                    return False
+                if day < last[0]:
+                    raise ValueError("Snapshots must be recorded in date order")
+                if day == last[0]:
+                    # Same-day snapshot replaces the previous one
+                    self._replace_last(series, assets, liabilities)
+                    return True
+            series.tail[0].append(day)
+            series.tail[1].append(assets)
+            series.tail[2].append(liabilities)
+            if len(series.tail[0]) >= _BUFFER_SIZE:
+                self._pack(series)
+            return True
+
+    def _pack(self, series):
+        """Merge the append buffer, downsampling what is older than `recent_days` before the last snapshot"""
+        days, assets, liabilities = series.decode()
+        if len(days):
+            series.pack(*_downsample(days, assets, liabilities, int(days[-1]) - self.recent_days))
+
+    def _replace_last(self, series, assets, liabilities):
+        if len(series.tail[0]):
+            series.tail[1][-1] = assets
+            series.tail[2][-1] = liabilities
+            return
+        days, all_assets, all_liabilities = series.decode()
+        all_assets[-1], all_liabilities[-1] = assets, liabilities
+        series.pack(days, all_assets, all_liabilities)
+
+    def snapshots(self, user_id):
+        """All stored snapshots for a user as a DataFrame"""
+        with self._lock:
+            series = self._get(user_id)
+            days, assets, liabilities = series.decode() if series else [np.empty(0, np.int64)] * 3
+        return self._frame(days.astype("datetime64[D]"), assets, liabilities)
+
+    def query(self, user_id, start=None, end=None, freq="M"):
+        """Values at the end of each period between start and end (inclusive)
+
+        Net worth is a step function, so each period reports the latest
+        snapshot on or before its last day.
+        """
+        unit, step = FREQUENCIES[freq]
+        with self._lock:
+            series = self._get(user_id)
+            if series is None:
+                return self._frame(np.empty(0, "datetime64[D]"), *[np.empty(0, np.int64)] * 2)
+            days, assets, liabilities = series.decode()
+
+        end_day = np.datetime64(end or date.today(), "D")
+        start_day = np.datetime64(start, "D") if start is not None else days[0].astype("datetime64[D]")
+        one = np.timedelta64(1, unit)
+        periods = np.arange(start_day.astype(f"datetime64[{unit}]"),
+                            end_day.astype(f"datetime64[{unit}]") + one, step * one)
+        period_ends = np.minimum((periods + step * one).astype("datetime64[D]") - np.timedelta64(1, "D"),
+                                 end_day)
+
+        index = np.searchsorted(days, period_ends.astype(np.int64), side="right") - 1
+        valid = index >= 0
+        index = np.where(valid, index, 0)
+        return self._frame(period_ends,
+                           np.where(valid, assets[index], -1),
+                           np.where(valid, liabilities[index], -1),
+                           missing=~valid)
+
+    @staticmethod
+    def _frame(dates, assets, liabilities, missing=None):
+        assets = assets / 100.0
+        liabilities = liabilities / 100.0
+        if missing is not None and missing.any():
+            assets[missing] = np.nan
+            liabilities[missing] = np.nan
+        return pd.DataFrame({
+            "Date": pd.to_datetime(dates),
+            "Assets": assets,
+            "Liabilities": liabilities,
+            "Net Worth": assets - liabilities
+        })
+
+    def compact(self, today=None):
+        """Downsample snapshots older than `recent_days` to one per month
+
+        Runs automatically for a user whenever their append buffer is packed
+        or their history is serialised.
+        """
+        cutoff = _day(today) - self.recent_days
+        with self._lock:
+            for series in self._series.values():
+                series.pack(*_downsample(*series.decode(), cutoff))
+
+    def nbytes(self, user_id=None):
+        with self._lock:
+            if user_id is not None:
+                series = self._get(user_id)
+                return series.nbytes if series else 0
+            return sum(series.nbytes for series in self._series.values())
+
+    def to_bytes(self, user_id):
+        """Serialise one user's history, downsampled like a packed append buffer"""
+        with self._lock:
+            series = self._get(user_id)
+            if series is None:
+                raise KeyError(user_id)
+            self._pack(series)
+            return _encode(series)
+
+    def from_bytes(self, user_id, blob):
+        series = _decode(blob)
+        with self._lock:
+            self._series[user_id] = series
+
+    def save(self, user_id):
+        """Write one user's history to its file in `directory`, replacing it atomically"""
+        blob = self.to_bytes(user_id)
+        path = self._path(user_id)
+        with self._save_lock:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(blob)
+            os.replace(temp_path, path)
+
+def _encode(series):
+    columns = (series.days, series.assets, series.liabilities)
+    header = _HEADER.pack(*(column.first for column in columns), series.length,
+                          *(_DTYPES.index(column.deltas.dtype.type) for column in columns))
+    return header + b"".join(column.deltas.tobytes() for column in columns)
+
+def _decode(blob):
+    series = _Series()
+    *firsts, length, d1, d2, d3 = _HEADER.unpack_from(blob)
+    offset = _HEADER.size
+    columns = []
+    for first, code in zip(firsts, (d1, d2, d3)):
+        column = _Column()
+        column.first = first
+        count = max(0, length - 1)
+        column.deltas = np.frombuffer(blob, dtype=_DTYPES[code], count=count, offset=offset).copy()
+        offset += column.deltas.nbytes
+        columns.append(column)
+    series.length = length
+    series.days, series.assets, series.liabilities = columns
+    return series
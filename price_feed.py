@@ -0,0 +1,190 @@
+import csv
+import json
+import math
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from currency import DEFAULT_CURRENCY
+from dashboard_schema import frame_from_columns
+
+# Batched quote fetching with a TTL cache, and a columnar portfolio that
+# revalues only the holdings whose prices changed.
+
+class FileQuoteSource:
+    """Quotes from a local JSON ({"AAPL": 189.5}) or CSV (ticker,price) file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self, tickers):
+        if self.path.endswith(".csv"):
+            with open(self.path, newline="") as f:
+                quotes = {row["ticker"]: float(row["price"]) for row in csv.DictReader(f)}
+        else:
+            with open(self.path) as f:
+                quotes = json.load(f)
+        wanted = set(tickers)
+        return {ticker: float(price) for ticker, price in quotes.items() if ticker in wanted}
+
+class HttpQuoteSource:
+    """Quotes from GET <url>?symbols=A,B,C returning {ticker: price}, `batch_size` symbols per request"""
+
+    def __init__(self, url, timeout=10, batch_size=200):
+        self.url = url
+        self.timeout = timeout
+        self.batch_size = batch_size  # Keeps the query string well under common URL length limits
+
+    def fetch(self, tickers):
+        quotes = {}
+        for start in range(0, len(tickers), self.batch_size):
+            batch = tickers[start:start + self.batch_size]
+            response = requests.get(self.url, params={"symbols": ",".join(batch)}, timeout=self.timeout)
+            response.raise_for_status()
+            quotes.update((ticker, float(price)) for ticker, price in response.json().items())
+        return quotes
+
+class PriceFeed:
+    """Caches quotes per ticker and fetches all stale ones in a single batch
+
+    Tickers the source has no quote for are cached as misses for the same
+    TTL, so unknown names do not trigger a request on every rerun.
+    """
+
+    def __init__(self, source, ttl=300):
+        self.source = source
+        self.ttl = ttl
+        self._quotes = {}
+        self._lock = threading.Lock()
+
+    def get_prices(self, tickers):
+        now = time.monotonic()
+        with self._lock:
+            stale = [t for t in set(tickers)
+                     if t not in self._quotes or now - self._quotes[t][1] > self.ttl]
+        if stale:
+            fetched = self.source.fetch(sorted(stale))
+            with self._lock:
+                for ticker in stale:
+                    self._quotes[ticker] = (fetched.get(ticker, math.nan), now)
+        with self._lock:
+            return {t: self._quotes[t][0] for t in tickers
+                    if t in self._quotes and not math.isnan(self._quotes[t][0])}
+
+    def clear(self):
+        with self._lock:
+            self._quotes.clear()
+
+class Portfolio:
+    """Holdings stored as numpy columns, revalued incrementally when prices change
+
+    Value and cost are kept in each holding's own currency, with running
+    totals per currency, so reporting in another currency is one multiply
+    per currency rather than per holding.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self.tickers = []
+        self._currency_codes = {}
+        self.currencies = []
+        self.size = 0
+        self._code = np.empty(0, dtype=np.int32)
+        self._currency = np.empty(0, dtype=np.int16)
+        self._shares = np.empty(0)
+        self._cost = np.empty(0)
+        self._current = np.empty(0)
+        self._value = np.empty(0)
+        self._code_prices = np.empty(0)
+        self._value_by_currency = np.zeros(0)
+        self._cost_by_currency = np.zeros(0)
+
+    def sync(self, investments):
+        """Append holdings added to `investments` since the last call"""
+        if len(investments) < self.size:
+            self.__init__()
+        new = investments[self.size:]
+        if not new:
+            return
+        codes = np.array([self._codes.setdefault(inv["ticker"], len(self._codes)) for inv in new],
+                         dtype=np.int32)
+        currency = np.array([self._currency_codes.setdefault(inv.get("currency", DEFAULT_CURRENCY),
+                                                             len(self._currency_codes))
+                             for inv in new], dtype=np.int16)
+        self.tickers = list(self._codes)
+        self.currencies = list(self._currency_codes)
+        shares = np.array([inv["shares"] for inv in new], dtype=float)
+        cost = np.array([inv["cost"] for inv in new], dtype=float)
+        current = np.array([inv["current"] for inv in new], dtype=float)
+
+        # Holdings of a ticker that already has a feed price use it straight away
+        known = np.full(len(self.tickers), np.nan)
+        known[:len(self._code_prices)] = self._code_prices
+        self._code_prices = known
+        current = np.where(np.isnan(known[codes]), current, known[codes])
+
+        self._code = np.concatenate([self._code, codes])
+        self._currency = np.concatenate([self._currency, currency])
+        self._shares = np.concatenate([self._shares, shares])
+        self._cost = np.concatenate([self._cost, cost])
+        self._current = np.concatenate([self._current, current])
+        value = shares * current
+        self._value = np.concatenate([self._value, value])
+
+        self._value_by_currency = np.append(
+            self._value_by_currency, np.zeros(len(self.currencies) - len(self._value_by_currency)))
+        self._cost_by_currency = np.append(
+            self._cost_by_currency, np.zeros(len(self.currencies) - len(self._cost_by_currency)))
+        np.add.at(self._value_by_currency, currency, value)
+        np.add.at(self._cost_by_currency, currency, shares * cost)
+        self.size = len(investments)
+
+    def set_prices(self, prices):
+        """Revalue only the holdings whose ticker price changed"""
+        if not prices or not self.size:
+            return
+        codes = np.array([self._codes[t] for t in prices if t in self._codes], dtype=np.int32)
+        values = np.array([prices[t] for t in prices if t in self._codes], dtype=float)
+        changed = self._code_prices[codes] != values
+        if not changed.any():
+            return
+        self._code_prices[codes[changed]] = values[changed]
+
+        rows = np.flatnonzero(np.isin(self._code, codes[changed]))
+        new_current = self._code_prices[self._code[rows]]
+        new_value = self._shares[rows] * new_current
+        np.add.at(self._value_by_currency, self._currency[rows], new_value - self._value[rows])
+        self._current[rows] = new_current
+        self._value[rows] = new_value
+
+    def _factors(self, fx, target):
+        if fx is None:
+            return np.ones(len(self.currencies))
+        return fx.factors(self.currencies, target)
+
+    def totals(self, fx=None, target=DEFAULT_CURRENCY):
+        """Total value and cost in `target`; `fx` is needed once holdings span currencies"""
+        factors = self._factors(fx, target)
+        return float(self._value_by_currency @ factors), float(self._cost_by_currency @ factors)
+
+    def to_frame(self, fx=None, target=DEFAULT_CURRENCY):
+        """Positions with Value, Cost and Gain converted into `target`"""
+        factor = self._factors(fx, target)[self._currency] if self.size else np.empty(0)
+        cost = self._shares * self._cost * factor
+        value = self._value * factor
+        gain = value - cost
+        gain_pct = np.divide(gain * 100, cost, out=np.full(self.size, np.nan), where=cost != 0)
+        return frame_from_columns("portfolio", {
+            "ticker": pd.Categorical.from_codes(self._code, self.tickers),
+            "currency": pd.Categorical.from_codes(self._currency, self.currencies),
+            "shares": self._shares,
+            "cost": self._cost,
+            "current": self._current,
+            "Value": value,
+            "Cost": cost,
+            "Gain": gain,
+            "Gain%": gain_pct
+        })
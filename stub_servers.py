@@ -0,0 +1,188 @@
+import gzip
+import io
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from data_client import ARROW, ENCODINGS, JSON, MSGPACK, negotiate
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+except ImportError:
+    pa = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# The zstd module urllib3 decodes with, so the stub offers zstd exactly when the client accepts it
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+# Local stand-ins for the Quarkus analysis service and the HuggingFace
+# inference API, used by the benchmark and load-test tools.
+
+STUB_RECOMMENDATION = """- Cut dining out by 15% and move the difference to savings
+- Review subscriptions every quarter
+- Automate a monthly transfer of 20% of income"""
+
+def stub_quotes(query):
+    """Deterministic price per ticker for GET /quotes?symbols=A,B,C"""
+    symbols = ",".join(query.get("symbols", [])).split(",")
+    return {s: round(random.Random(s).uniform(5, 500), 2) for s in symbols if s}
+
+def stub_transactions(count, categories):
+    """Paged GET /analysis/transactions?page=N&size=M over `count` generated rows"""
+    def page(query):
+        number = int(query.get("page", ["0"])[0])
+        size = int(query.get("size", ["1000"])[0])
+        start, end = number * size, min(count, (number + 1) * size)
+        return [{
+            "id": i,
+            "date": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "category": categories[i % len(categories)],
+            "description": f"Transaction {i}",
+            "amount": round(5 + (i * 7919) % 50000 / 100, 2)
+        } for i in range(start, end)]
+    return page
+
+def make_fixture(size, seed=42, transactions=None):
+    """Build a Quarkus payload set with `size` spending categories"""
+    rng = random.Random(seed)
+    spending = {f"Category {i:04d}": round(rng.uniform(20, 800), 2) for i in range(size)}
+    total_expenses = round(sum(spending.values()), 2)
+    total_income = round(total_expenses * rng.uniform(1.1, 1.6), 2)
+    return {
+        "/analysis/spending-by-category": spending,
+        "/analysis/total-summary": {
+            "totalIncome": total_income,
+            "totalExpenses": total_expenses,
+            "savings": round(total_income - total_expenses, 2),
+            "spending_by_category": spending
+        },
+        "/analysis/transactions": stub_transactions(
+            size * 100 if transactions is None else transactions, list(spending) or ["Other"]),
+        "/quotes": stub_quotes,
+        "/fx/rates": {"base": "EUR", "rates": {"EUR": 1.0, "USD": 1.08, "GBP": 0.85}}
+    }
+
+class _QuarkusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        payload = self.server.fixture.get(parsed.path)
+        if payload is None:
+            self.send_error(404)
+            return
+        if callable(payload):
+            payload = payload(parse_qs(parsed.query))
+        self._send_negotiated(payload)
+
+    def _send_negotiated(self, payload):
+        """Answer in the format and compression the Accept headers rank highest"""
+        table = isinstance(payload, list)
+        # JSON first so clients that accept anything keep getting JSON
+        offered = [JSON] + ([ARROW] if table and pa else []) + ([MSGPACK] if msgpack else [])
+        content_type = negotiate(self.headers.get("Accept"), offered) or JSON
+        if content_type == ARROW:
+            sink = io.BytesIO()
+            batch = pa.Table.from_pylist(payload)
+            with pa.ipc.new_stream(sink, batch.schema) as writer:
+                writer.write_table(batch)
+            body = sink.getvalue()
+        elif content_type == MSGPACK:
+            if table:
+                # Tables go column-oriented so the client builds the frame without row dicts
+                payload = {key: [row[key] for row in payload] for key in (payload[0] if payload else {})}
+            body = msgpack.packb(payload)
+        else:
+            body = json.dumps(payload).encode("utf-8")
+
+        encodings = [e for e in ENCODINGS if e != "zstd" or zstd]
+        encoding = negotiate(self.headers.get("Accept-Encoding") or "identity", encodings)
+        if encoding == "zstd":
+            body = zstd.compress(body)
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=6)
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept, Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class _InferenceHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps([{"generated_text": STUB_RECOMMENDATION}]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer:
+    """Run a handler on a free localhost port in a daemon thread"""
+
+    def __init__(self, handler, fixture=None):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixture = fixture or {}
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set_fixture(self, fixture):
+        self.httpd.fixture = fixture
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def quarkus_stub(size=10, seed=42, transactions=None):
+    return StubServer(_QuarkusHandler, make_fixture(size, seed, transactions))
+
+def inference_stub():
+    return StubServer(_InferenceHandler)
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run the local Quarkus and inference stubs")
+    parser.add_argument("--size", type=int, default=10, help="Number of spending categories")
+    args = parser.parse_args()
+
+    with quarkus_stub(args.size) as quarkus, inference_stub() as inference:
+        print(f"QUARKUS_API = \"{quarkus.url}\"")
+        print(f"HUGGINGFACE_MODEL = \"{inference.url}\"")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
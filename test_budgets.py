@@ -0,0 +1,17 @@
+from budgets import budget_frame, edits_by_category, empty_budgets
+
+def test_row_edits_are_kept_by_category_when_the_rows_change():
+    previous = ("Rent", "Food", "Fun")
+    edits = {"0": {"Budget": 999}, "2": {"Budget": None}}
+    budgets = edits_by_category(empty_budgets(), previous, edits)
+
+    frame = budget_frame({"Car": 50.0, "Food": 300.0, "Rent": 1000.0, "Fun": 100.0}, budgets)
+    assert dict(zip(frame["Category"], frame["Budget"])) == {
+        "Car": 60.0, "Food": 360.0, "Rent": 999.0, "Fun": 0.0
+    }
+
+def test_edited_categories_replace_their_saved_budget():
+    saved = edits_by_category(empty_budgets(), ("Rent", "Food"), {"0": {"Budget": 800}, "1": {"Budget": 200}})
+    budgets = edits_by_category(saved, ("Rent", "Food"), {"1": {"Budget": 250}})
+    assert sorted(zip(budgets["Category"], budgets["Budget"])) == [("Food", 250.0), ("Rent", 800.0)]
+    assert edits_by_category(saved, ("Rent",), {}) is saved
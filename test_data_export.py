@@ -0,0 +1,44 @@
+import io
+
+import pandas as pd
+import pytest
+
+from data_export import NEVER_PAID_OFF, debt_schedule_chunks, forecast_chunks, spending_chunks, write_export
+
+DEBTS = [
+    {"name": "Card", "balance": 1000.0, "rate": 12.0, "payment": 100.0, "currency": "USD"},
+    {"name": "Loan", "balance": 5000.0, "rate": 24.0, "payment": 50.0, "currency": "EUR"}  # 100/month interest
+]
+
+def _schedule(debts):
+    return pd.concat(debt_schedule_chunks(debts, chunk_months=6), ignore_index=True)
+
+def test_debt_schedule_amortises_to_zero():
+    card = _schedule(DEBTS[:1])
+    assert card["Balance"].iloc[-1] == 0
+    assert card["Principal"].sum() == pytest.approx(1000)
+    assert (card["Currency"] == "USD").all()
+    assert (card["Note"] == "").all()
+
+def test_debt_that_never_amortises_is_flagged_once():
+    schedule = _schedule(DEBTS)
+    loan = schedule[schedule["Debt"] == "Loan"]
+    assert len(loan) == 1
+    row = loan.iloc[0]
+    assert row["Month"] == 1 and row["Note"] == NEVER_PAID_OFF
+    assert row["Balance"] == 5000 and row["Principal"] <= 0
+    assert (schedule.loc[schedule["Debt"] == "Card", "Note"] == "").all()
+
+def test_amounts_are_scaled_into_the_reporting_currency():
+    spending = next(spending_chunks({"Food": 100.0, "Rent": 800.0}, rate=1.1))
+    assert list(spending["Amount"]) == pytest.approx([110, 880])
+    forecast = next(forecast_chunks({"totalIncome": 1000, "totalExpenses": 600}, 3, 0, 0, rate=2))
+    assert list(forecast["Income"]) == pytest.approx([2000] * 3)
+    assert list(forecast["Savings"]) == pytest.approx([800] * 3)
+
+def test_csv_export_keeps_one_header():
+    out = io.BytesIO()
+    write_export(debt_schedule_chunks(DEBTS, chunk_months=2), "csv", out)
+    text = out.getvalue().decode("utf-8")
+    assert text.count("Debt,Currency,Month") == 1
+    assert len(pd.read_csv(io.StringIO(text))) == len(_schedule(DEBTS))
@@ -0,0 +1,76 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from goal_solver import HORIZON_MONTHS, allocate_savings, project_cash_flow, solve_goals
+
+TODAY = date(2026, 1, 15)
+IN_A_YEAR = date(2027, 1, 15)
+
+def test_surplus_is_shared_by_remaining_amount():
+    plan = solve_goals([1200, 600], [0, 0], [IN_A_YEAR, IN_A_YEAR], [300] * 24, today=TODAY)
+    np.testing.assert_allclose(plan["Required Monthly"], [100, 50])
+    np.testing.assert_allclose(plan["Allocated Monthly"], [200, 100])
+    assert list(plan["Projected Completion"]) == [pd.Timestamp("2026-07-01")] * 2
+    assert plan["On Track"].all()
+
+def test_underfunded_goals_get_the_same_fraction_of_what_they_need():
+    plan = solve_goals([1200, 600], [0, 0], [IN_A_YEAR, IN_A_YEAR], [75] * 24, today=TODAY)
+    np.testing.assert_allclose(plan["Allocated Monthly"], [50, 25])
+    assert list(plan["Projected Completion"]) == [pd.Timestamp("2028-01-01")] * 2
+    np.testing.assert_allclose(plan["Feasibility"], [0.5, 0.5])
+    assert not plan["On Track"].any()
+
+def test_past_due_goals_need_the_whole_remainder_this_month():
+    plan = solve_goals([1000], [400], [date(2025, 6, 1)], [100] * 12, today=TODAY)
+    np.testing.assert_allclose(plan["Required Monthly"], [600])
+    np.testing.assert_allclose(plan["Allocated Monthly"], [100])
+    assert plan["Projected Completion"][0] == pd.Timestamp("2026-07-01")
+    assert plan["Feasibility"][0] == pytest.approx(100 / 600)
+
+def test_goals_already_met_are_complete_and_take_nothing():
+    plan = solve_goals([500, 1200], [800, 0], [IN_A_YEAR, IN_A_YEAR], [300] * 12, today=TODAY)
+    np.testing.assert_allclose(plan["Required Monthly"], [0, 100])
+    np.testing.assert_allclose(plan["Allocated Monthly"], [0, 300])
+    assert plan["Projected Completion"][0] == pd.Timestamp("2026-01-01")
+    assert plan["Feasibility"][0] == 1
+    assert plan["On Track"][0]
+
+def test_without_savings_no_goal_completes():
+    plan = solve_goals([1200], [0], [IN_A_YEAR], [-50] * 12, today=TODAY)
+    assert plan["Allocated Monthly"][0] == 0
+    assert pd.isna(plan["Projected Completion"][0])
+    assert plan["Feasibility"][0] == 0
+
+def test_last_forecast_month_is_held_beyond_the_forecast():
+    plan = solve_goals([1200], [0], [IN_A_YEAR], [100, 100], today=TODAY)
+    assert plan["Projected Completion"][0] == pd.Timestamp("2027-01-01")
+    assert plan["On Track"][0]
+
+def test_completion_matches_a_month_by_month_simulation():
+    rng = np.random.default_rng(3)
+    targets = rng.uniform(1_000, 50_000, 20)
+    saved = targets * rng.uniform(0, 0.8, 20)
+    deadlines = [date(2026 + int(y), int(m), 1) for y, m in zip(rng.integers(0, 6, 20), rng.integers(1, 13, 20))]
+    _, _, savings = project_cash_flow(4000, 3500, 0.3, 0.2, 120)
+    plan = solve_goals(targets, saved, deadlines, savings, today=TODAY)
+
+    share = plan["Allocated Monthly"].to_numpy() / savings[0]
+    for i in range(20):
+        total, month = 0.0, 0
+        while total < targets[i] - saved[i] - 1e-9 and month < HORIZON_MONTHS:
+            total += share[i] * (savings[month] if month < len(savings) else savings[-1])
+            month += 1
+        if total < targets[i] - saved[i] - 1e-9:
+            assert pd.isna(plan["Projected Completion"][i])
+        else:
+            expected = pd.Timestamp(np.datetime64("2026-01", "M") + np.timedelta64(month, "M"))
+            assert plan["Projected Completion"][i] == expected
+
+def test_allocation_never_exceeds_the_budget():
+    required = np.array([100.0, 50.0, 0.0])
+    remaining = np.array([1200.0, 600.0, 0.0])
+    for budget in (0.0, 75.0, 150.0, 1000.0):
+        assert allocate_savings(required, remaining, budget).sum() == pytest.approx(budget)
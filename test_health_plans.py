@@ -0,0 +1,41 @@
+import pytest
+
+from health_plans import PlanStore
+
+def _flaky():
+    calls = []
+    def job():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("service down")
+        return len(calls)
+    return job, calls
+
+def test_finished_jobs_are_shared():
+    store = PlanStore()
+    first = store.submit("k", lambda: 42)
+    assert first.result() == 42
+    assert store.submit("k", lambda: 0) is first
+
+def test_failed_job_is_kept_until_retried():
+    store = PlanStore()
+    job, calls = _flaky()
+    failed = store.submit("k", job)
+    with pytest.raises(RuntimeError):
+        failed.result()
+    for _ in range(5):
+        assert store.submit("k", job) is failed
+    assert len(calls) == 1
+
+    retried = store.submit("k", job, retry=True)
+    assert retried.result() == 2
+    assert store.submit("k", job, retry=True) is retried
+
+def test_least_recently_used_snapshots_are_forgotten():
+    store = PlanStore(max_snapshots=2)
+    a = store.submit("a", lambda: 1)
+    store.submit("b", lambda: 2)
+    store.submit("a", lambda: 1)
+    store.submit("c", lambda: 3)
+    assert store.submit("a", lambda: 1) is a
+    assert store.submit("b", lambda: 20).result() == 20  # Forgotten, so computed again
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from networth_history import NetWorthHistory
+
+START = date(2024, 1, 1)
+
+def _fill(history, user_id, days, step=1):
+    for i in range(days):
+        history.record(user_id, 1000 + i * 10.25, 500 - i * 0.5, when=START + timedelta(days=i * step))
+
+def test_snapshots_round_trip_to_the_cent():
+    history = NetWorthHistory()
+    _fill(history, "u", 100)
+    snapshots = history.snapshots("u")
+    assert len(snapshots) == 100
+    assert snapshots["Date"].iloc[0].date() == START
+    np.testing.assert_allclose(snapshots["Assets"], 1000 + np.arange(100) * 10.25)
+    np.testing.assert_allclose(snapshots["Liabilities"], 500 - np.arange(100) * 0.5)
+
+def test_deltas_use_the_narrowest_dtype():
+    history = NetWorthHistory()
+    _fill(history, "u", 64)
+    series = history._series["u"]
+    assert series.days.deltas.dtype == np.int8  # One day apart
+    assert series.assets.deltas.dtype == np.int16  # 1025 cents apart
+    assert series.liabilities.deltas.dtype == np.int8  # -50 cents apart
+
+def test_large_jumps_widen_the_dtype():
+    history = NetWorthHistory()
+    history.record("u", 0, 0, when=START)
+    history.record("u", 10_000_000, 0, when=START + timedelta(days=1))
+    history.to_bytes("u")  # Packs the append buffer
+    series = history._series["u"]
+    assert series.assets.deltas.dtype == np.int32
+    np.testing.assert_allclose(history.snapshots("u")["Assets"], [0, 10_000_000])
+
+def test_unchanged_and_same_day_snapshots():
+    history = NetWorthHistory()
+    assert history.record("u", 100, 50, when=START)
+    assert not history.record("u", 100, 50, when=START + timedelta(days=1))
+    assert history.record("u", 120, 50, when=START + timedelta(days=1))
+    assert history.record("u", 130, 50, when=START + timedelta(days=1))
+    snapshots = history.snapshots("u")
+    assert len(snapshots) == 2
+    assert snapshots["Assets"].iloc[-1] == 130
+
+def test_out_of_order_snapshot_is_rejected():
+    history = NetWorthHistory()
+    history.record("u", 100, 50, when=START + timedelta(days=1))
+    with pytest.raises(ValueError):
+        history.record("u", 200, 50, when=START)
+
+@pytest.mark.parametrize("days", [1, 2, 31, 100])
+def test_to_bytes_from_bytes_round_trip(days):
+    history = NetWorthHistory()
+    _fill(history, "u", days)
+    before = history.snapshots("u")
+
+    restored = NetWorthHistory()
+    restored.from_bytes("u", history.to_bytes("u"))
+    after = restored.snapshots("u")
+    assert after.equals(before)
+    assert restored.nbytes("u") == history.nbytes("u")
+
+def test_restored_history_keeps_recording():
+    history = NetWorthHistory()
+    _fill(history, "u", 40)
+    restored = NetWorthHistory()
+    restored.from_bytes("u", history.to_bytes("u"))
+    assert restored.record("u", 1, 2, when=START + timedelta(days=40))
+    assert len(restored.snapshots("u")) == 41
+
+def test_each_user_is_saved_to_its_own_file(tmp_path):
+    history = NetWorthHistory(directory=str(tmp_path))
+    _fill(history, "alice@example.com", 50)
+    _fill(history, "bob@example.com", 5, step=7)
+    history.save("alice@example.com")
+    assert [p.name for p in tmp_path.iterdir()] == ["alice@example.com.nwh"]
+    history.save("bob@example.com")
+
+    loaded = NetWorthHistory(directory=str(tmp_path))
+    for user_id in ("alice@example.com", "bob@example.com"):
+        assert loaded.snapshots(user_id).equals(history.snapshots(user_id))
+    assert loaded.snapshots("carol@example.com").empty
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_user_ids_cannot_escape_the_directory(tmp_path):
+    history = NetWorthHistory(directory=str(tmp_path / "histories"))
+    history.record("../outside", 1, 0, when=START)
+    history.save("../outside")
+    assert [p.parent.name for p in tmp_path.rglob("*.nwh")] == ["histories"]
+
+def test_saving_after_every_snapshot_still_downsamples(tmp_path):
+    saved = NetWorthHistory(directory=str(tmp_path))
+    unsaved = NetWorthHistory()
+    for i in range(2000):
+        when = START + timedelta(days=i)
+        saved.record("u", 1000 + i, 500, when=when)
+        saved.save("u")
+        unsaved.record("u", 1000 + i, 500, when=when)
+    unsaved.to_bytes("u")  # Packs the last append buffer
+    kept = saved.snapshots("u")
+    assert kept.equals(unsaved.snapshots("u"))
+    assert len(kept) < 2000
+    assert (kept["Date"] >= pd.Timestamp(START + timedelta(days=1999 - 730))).sum() == 731
+
+def test_compact_keeps_month_ends_of_old_snapshots():
+    history = NetWorthHistory(recent_days=30)
+    _fill(history, "u", 90)
+    history.compact(today=START + timedelta(days=89))
+    days = history.snapshots("u")["Date"].dt.date
+    cutoff = START + timedelta(days=59)
+    # Only January's last snapshot survives; February's last day is inside the recent window
+    assert list(days[days < cutoff]) == [date(2024, 1, 31)]
+    assert (days >= cutoff).sum() == 31
+
+def test_query_reports_latest_value_per_period():
+    history = NetWorthHistory()
+    history.record("u", 100, 0, when=date(2024, 1, 10))
+    history.record("u", 200, 0, when=date(2024, 3, 5))
+    monthly = history.query("u", start=date(2024, 1, 1), end=date(2024, 3, 31), freq="M")
+    assert list(monthly["Net Worth"]) == [100, 100, 200]
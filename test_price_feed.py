@@ -0,0 +1,108 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from currency import FxRates
+from price_feed import PriceFeed, Portfolio
+
+RATES = {"EUR": 1.0, "USD": 1.08, "GBP": 0.85}
+FX = FxRates(RATES)
+
+def _holdings(count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        "ticker": f"T{rng.randrange(count // 3 + 1)}",
+        "currency": rng.choice(["EUR", "USD", "GBP"]),
+        "shares": rng.randint(1, 50),
+        "cost": round(rng.uniform(5, 200), 2),
+        "current": round(rng.uniform(5, 200), 2)
+    } for _ in range(count)]
+
+def _recompute(investments, prices, target="EUR"):
+    """Totals from scratch: every holding at its ticker's latest price, converted one by one"""
+    value = cost = 0.0
+    for inv in investments:
+        price = prices.get(inv["ticker"], inv["current"])
+        factor = RATES[target] / RATES[inv["currency"]]
+        value += inv["shares"] * price * factor
+        cost += inv["shares"] * inv["cost"] * factor
+    return value, cost
+
+def test_incremental_revaluation_matches_a_full_recompute():
+    rng = random.Random(1)
+    investments = _holdings(300)
+    portfolio, prices = Portfolio(), {}
+    for end in (50, 120, 121, 300):
+        portfolio.sync(investments[:end])
+        update = {t: round(rng.uniform(5, 200), 2) for t in rng.sample(portfolio.tickers, 10)}
+        portfolio.set_prices(update)
+        prices.update(update)
+        portfolio.set_prices(update)  # Unchanged prices leave the totals alone
+
+        for target in ("EUR", "USD"):
+            expected = _recompute(investments[:end], prices, target)
+            assert portfolio.totals(FX, target) == pytest.approx(expected, rel=1e-12)
+            frame = portfolio.to_frame(FX, target)
+            assert frame["Value"].sum() == pytest.approx(expected[0], rel=1e-12)
+
+def test_running_totals_are_kept_per_currency():
+    portfolio = Portfolio()
+    portfolio.sync([
+        {"ticker": "A", "currency": "USD", "shares": 2, "cost": 10.0, "current": 15.0},
+        {"ticker": "B", "currency": "GBP", "shares": 1, "cost": 40.0, "current": 50.0},
+        {"ticker": "A", "currency": "USD", "shares": 3, "cost": 12.0, "current": 15.0}
+    ])
+    portfolio.set_prices({"A": 20.0})
+    assert portfolio.currencies == ["USD", "GBP"]
+    np.testing.assert_allclose(portfolio._value_by_currency, [100.0, 50.0])
+    np.testing.assert_allclose(portfolio._cost_by_currency, [56.0, 40.0])
+
+def test_new_holdings_use_a_known_feed_price():
+    portfolio = Portfolio()
+    portfolio.sync([{"ticker": "A", "shares": 1, "cost": 10.0, "current": 10.0}])
+    portfolio.set_prices({"A": 30.0})
+    portfolio.sync([
+        {"ticker": "A", "shares": 1, "cost": 10.0, "current": 10.0},
+        {"ticker": "A", "shares": 2, "cost": 25.0, "current": 25.0},
+        {"ticker": "B", "shares": 1, "cost": 5.0, "current": 6.0}
+    ])
+    frame = portfolio.to_frame()
+    assert list(frame["current"]) == [30.0, 30.0, 6.0]
+    assert portfolio.totals() == (96.0, 65.0)
+
+def test_removed_holdings_rebuild_the_portfolio():
+    investments = _holdings(20)
+    portfolio = Portfolio()
+    portfolio.sync(investments)
+    portfolio.sync(investments[:5])
+    assert portfolio.size == 5
+    assert portfolio.totals(FX) == pytest.approx(_recompute(investments[:5], {}), rel=1e-12)
+
+class _CountingSource:
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self.calls = []
+
+    def fetch(self, tickers):
+        self.calls.append(tickers)
+        return {t: self.quotes[t] for t in tickers if t in self.quotes}
+
+def test_stale_quotes_are_fetched_in_one_batch_and_misses_are_cached():
+    source = _CountingSource({"A": 1.5, "B": 2.5})
+    feed = PriceFeed(source, ttl=60)
+    assert feed.get_prices(["A", "B", "ZZZ"]) == {"A": 1.5, "B": 2.5}
+    assert feed.get_prices(["B", "ZZZ", "A"]) == {"B": 2.5, "A": 1.5}
+    assert source.calls == [["A", "B", "ZZZ"]]
+
+    feed.get_prices(["A", "C"])
+    assert source.calls[-1] == ["C"]
+
+def test_expired_quotes_are_fetched_again():
+    source = _CountingSource({"A": 1.5})
+    feed = PriceFeed(source, ttl=0)
+    feed.get_prices(["A"])
+    source.quotes["A"] = 2.0
+    assert math.isclose(feed.get_prices(["A"])["A"], 2.0)
+    assert len(source.calls) == 2